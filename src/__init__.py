@@ -10,7 +10,6 @@ __author__ = "Alysson"
 from .config import Settings, get_settings
 from .core import DisplacementRecord, TeamAverages, ProcessingResult
 from .services import ProcessingPipeline
-from .reports import ReportGenerator
 
 __all__ = [
     "Settings",
@@ -21,3 +20,11 @@ __all__ = [
     "ProcessingPipeline",
     "ReportGenerator",
 ]
+
+
+def __getattr__(name: str):
+    # ReportGenerator (python-docx) is only loaded when first accessed
+    if name == "ReportGenerator":
+        from .reports import ReportGenerator
+        return ReportGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
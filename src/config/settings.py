@@ -36,6 +36,8 @@ class FileSettings:
     report_file: str = "relatorio_analise_equipes.docx"
     encoding_input: str = "latin1"
     encoding_output: str = "utf-8"
+    # Layout of the timestamp columns (Despachada, A_Caminho, Liberada, ...)
+    datetime_format: str = "%d/%m/%Y %H:%M"
 
 
 @dataclass(frozen=True)
@@ -98,7 +100,7 @@ class CalculatedColumns:
         ]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MetricsTargets:
     """Target values for metrics analysis."""
     
@@ -5,8 +5,9 @@ This module provides reusable utility functions for datetime operations,
 column resolution, and data transformations.
 """
 
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Tuple
 from datetime import datetime
+import sys
 import pandas as pd
 import numpy as np
 
@@ -14,11 +15,58 @@ import numpy as np
 class DateTimeUtils:
     """Utility class for datetime operations."""
     
+    # Layouts tried, in order, when no explicit format is given (day-first data)
+    COMMON_FORMATS = (
+        "%d/%m/%Y %H:%M",
+        "%d/%m/%Y %H:%M:%S",
+        "%d/%m/%Y",
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%d %H:%M",
+        "%Y-%m-%d",
+    )
+    # Same layouts for month-first data (dayfirst=False)
+    MONTH_FIRST_FORMATS = (
+        "%m/%d/%Y %H:%M",
+        "%m/%d/%Y %H:%M:%S",
+        "%m/%d/%Y",
+        "%Y-%m-%d %H:%M:%S",
+        "%Y-%m-%d %H:%M",
+        "%Y-%m-%d",
+    )
+    
+    @staticmethod
+    def infer_format(series: pd.Series, dayfirst: bool = True) -> Optional[str]:
+        """
+        Guess the strptime format from the first non-null value of a series.
+        
+        Args:
+            series: Pandas series containing date strings
+            dayfirst: Try the day-first layouts (``COMMON_FORMATS``) or the
+                month-first ones (``MONTH_FIRST_FORMATS``)
+            
+        Returns:
+            The first matching layout for the (stripped) sample, or None
+        """
+        sample = series.dropna()
+        if sample.empty or not isinstance(sample.iloc[0], str):
+            return None
+        value = sample.iloc[0].strip()
+        formats = DateTimeUtils.COMMON_FORMATS if dayfirst else DateTimeUtils.MONTH_FIRST_FORMATS
+        for fmt in formats:
+            try:
+                datetime.strptime(value, fmt)
+                return fmt
+            except ValueError:
+                continue
+        return None
+    
     @staticmethod
     def parse_datetime(
         series: pd.Series,
         dayfirst: bool = True,
-        errors: str = "coerce"
+        errors: str = "coerce",
+        format: Optional[str] = None,
+        cache: bool = True
     ) -> pd.Series:
         """
         Parse a series of strings to datetime objects.
@@ -27,17 +75,51 @@ class DateTimeUtils:
             series: Pandas series containing date strings
             dayfirst: Whether to interpret ambiguous dates as day-first
             errors: How to handle parsing errors ('coerce', 'raise', 'ignore')
+            format: Expected strptime format. If None, it is inferred from the
+                first value (see ``infer_format``), following ``dayfirst``.
+                Values that do not match it (after stripping surrounding
+                whitespace) are tried against the other known layouts, and
+                only what is left goes through the generic (slower) parser.
+            cache: Parse each distinct string only once
             
         Returns:
             Pandas series with datetime objects
         """
-        return pd.to_datetime(series, dayfirst=dayfirst, errors=errors)
+        if format is None:
+            format = DateTimeUtils.infer_format(series, dayfirst=dayfirst)
+        if format is None:
+            return pd.to_datetime(series, dayfirst=dayfirst, errors=errors, cache=cache)
+        
+        # Stripped like the sample used for inference, so padded values still
+        # match; object columns qualify as long as their non-null values are str
+        if pd.api.types.infer_dtype(series, skipna=True) == "string":
+            series = series.str.strip()
+        parsed = pd.to_datetime(series, format=format, errors="coerce", cache=cache)
+        unparsed = parsed.isna() & series.notna()
+        
+        # Mixed layouts in one column: explicit formats first, so an ISO value
+        # next to day-first ones is never read through the day-first heuristics
+        formats = DateTimeUtils.COMMON_FORMATS if dayfirst else DateTimeUtils.MONTH_FIRST_FORMATS
+        for fmt in formats:
+            if not unparsed.any():
+                break
+            if fmt == format:
+                continue
+            parsed[unparsed] = pd.to_datetime(series[unparsed], format=fmt, errors="coerce", cache=cache)
+            unparsed = parsed.isna() & series.notna()
+        
+        if unparsed.any():
+            parsed[unparsed] = pd.to_datetime(series[unparsed], dayfirst=dayfirst, errors=errors, cache=cache)
+        return parsed
     
     @staticmethod
     def diff_minutes(a: Any, b: Any) -> Optional[float]:
         """
         Calculate the difference in minutes between two datetime objects.
         
+        Deprecated for column-wise use: prefer ``diff_minutes_series`` over
+        calling this per row.
+        
         Args:
             a: First datetime (should be later)
             b: Second datetime (should be earlier)
@@ -49,18 +131,48 @@ class DateTimeUtils:
             return np.nan
         return (a - b).total_seconds() / 60.0
     
+    @staticmethod
+    def diff_minutes_series(a: pd.Series, b: pd.Series) -> pd.Series:
+        """
+        Vectorized difference in minutes between two aligned datetime series.
+        
+        Works on the int64 nanosecond views directly, skipping the intermediate
+        timedelta64 Series. Non-datetime inputs are parsed first (day-first).
+        
+        Args:
+            a: Later datetimes
+            b: Earlier datetimes (same index as ``a``)
+            
+        Returns:
+            Float series of minutes, NaN where either side is NaT
+        """
+        if not pd.api.types.is_datetime64_any_dtype(a):
+            a = pd.to_datetime(a, dayfirst=True, errors="coerce")
+        if not pd.api.types.is_datetime64_any_dtype(b):
+            b = pd.to_datetime(b, dayfirst=True, errors="coerce")
+        ai = a.to_numpy(dtype="datetime64[ns]").view("i8")
+        bi = b.to_numpy(dtype="datetime64[ns]").view("i8")
+        nat = np.iinfo(np.int64).min
+        minutes = (ai - bi) / 1e9 / 60.0
+        minutes[(ai == nat) | (bi == nat)] = np.nan
+        return pd.Series(minutes, index=a.index)
+    
     @staticmethod
     def extract_date(series: pd.Series) -> pd.Series:
         """
         Extract date component from datetime series.
         
+        Series that are already datetime64 are not re-parsed.
+        
         Args:
-            series: Pandas series with datetime objects
+            series: Pandas series with datetime objects or date strings
             
         Returns:
             Pandas series with date objects
         """
-        return pd.to_datetime(series, dayfirst=True, errors="coerce").dt.date
+        if not pd.api.types.is_datetime64_any_dtype(series):
+            series = pd.to_datetime(series, dayfirst=True, errors="coerce")
+        return series.dt.date
     
     @staticmethod
     def format_datetime(dt: datetime, fmt: str = "%d/%m/%Y %H:%M") -> str:
@@ -90,12 +202,25 @@ class ColumnResolver:
             dataframe: DataFrame to resolve columns from
         """
         self._df = dataframe
-        self._columns = set(dataframe.columns)
+        # Column name -> position; names are interned so lookups with the (interned)
+        # candidate constants from settings mostly reduce to identity checks
+        self._columns = {
+            (sys.intern(col) if isinstance(col, str) else col): pos
+            for pos, col in enumerate(dataframe.columns)
+        }
+        self._columns_tuple = tuple(self._columns)
+        # Lower-cased name -> first column with that name, built once for case-insensitive lookups
+        self._lower_map: dict = {}
+        for col in dataframe.columns:
+            self._lower_map.setdefault(str(col).lower(), col)
     
     def resolve(self, candidates: List[str]) -> Optional[str]:
         """
         Find the first matching column from a list of candidates.
         
+        Exact names take precedence; otherwise candidates are matched
+        case-insensitively.
+        
         Args:
             candidates: List of possible column names in order of preference
             
@@ -103,9 +228,13 @@ class ColumnResolver:
             First matching column name, or None if no match found
         """
         for candidate in candidates:
+            candidate = sys.intern(candidate)
             if candidate in self._columns:
                 return candidate
-        return None
+        return next(
+            (self._lower_map[c.lower()] for c in candidates if c.lower() in self._lower_map),
+            None
+        )
     
     def resolve_all(self, mappings: dict) -> dict:
         """
@@ -134,9 +263,9 @@ class ColumnResolver:
         """
         return column in self._columns
     
-    def get_columns(self) -> List[str]:
-        """Return list of all column names."""
-        return list(self._columns)
+    def get_columns(self) -> Tuple[str, ...]:
+        """Return all column names, in frame order (cached, immutable)."""
+        return self._columns_tuple
 
 
 class DataFrameUtils:
@@ -156,6 +285,36 @@ class DataFrameUtils:
         """
         return series.round(decimals)
     
+    @staticmethod
+    def safe_round_inplace(
+        df: pd.DataFrame,
+        columns: List[str],
+        decimals: int = 2
+    ) -> pd.DataFrame:
+        """
+        Round columns of a DataFrame in place, reusing their buffers.
+        
+        Float columns backed by a writable NumPy buffer are rounded with
+        ``np.round(..., out=...)``, so no new array is allocated. Other
+        columns fall back to ``safe_round`` and are reassigned. Note that
+        ``df`` is modified (as is any frame sharing its data).
+        
+        Args:
+            df: DataFrame whose columns are rounded
+            columns: Columns to round
+            decimals: Number of decimal places
+            
+        Returns:
+            The same DataFrame, for chaining
+        """
+        for col in columns:
+            values = df[col].to_numpy()
+            if np.issubdtype(values.dtype, np.floating) and values.flags.writeable:
+                np.round(values, decimals, out=values)
+            else:
+                df[col] = DataFrameUtils.safe_round(df[col], decimals)
+        return df
+    
     @staticmethod
     def reorder_columns(
         df: pd.DataFrame,
@@ -176,15 +335,16 @@ class DataFrameUtils:
         if before_column not in df.columns:
             return df
         
-        cols = [c for c in df.columns if c not in columns_to_move]
+        to_move = set(columns_to_move)
+        cols = [c for c in df.columns if c not in to_move]
         
         if before_column in cols:
             idx = cols.index(before_column)
             existing_cols = [c for c in columns_to_move if c in df.columns]
-            for col in reversed(existing_cols):
-                cols.insert(idx, col)
+            cols = cols[:idx] + existing_cols + cols[idx:]
         
-        return df[[c for c in cols if c in df.columns]]
+        # Single positional take with the final order
+        return df.iloc[:, df.columns.get_indexer(cols)]
     
     @staticmethod
     def filter_by_status(
@@ -206,8 +366,28 @@ class DataFrameUtils:
             Filtered DataFrame
         """
         if status_column not in df.columns:
-            return df if inverse else pd.DataFrame()
+            return df if inverse else df.iloc[:0]
+        
+        mask = DataFrameUtils.status_mask(df[status_column], status_value)
+        
+        return df[~mask] if inverse else df[mask]
+    
+    @staticmethod
+    def status_mask(series: pd.Series, status_value: str) -> np.ndarray:
+        """
+        Boolean mask of the rows whose normalized status equals ``status_value``.
         
-        mask = df[status_column].astype(str).str.strip().str.lower() == status_value.lower()
+        The strip/lower normalization runs on the distinct labels (categories)
+        only and is mapped back to the rows through the category codes.
         
-        return df[~mask].copy() if inverse else df[mask].copy()
+        Args:
+            series: Status column
+            status_value: Status value to match (case/whitespace-insensitive)
+            
+        Returns:
+            NumPy boolean array aligned with ``series``; missing values never match
+        """
+        status = series.astype("category")
+        labels = status.cat.categories.astype(str).str.strip().str.lower()
+        # Code -1 (missing status) maps to the trailing False
+        return np.append(labels == status_value.lower(), False)[status.cat.codes]
@@ -19,7 +19,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.config import get_settings
 from src.services import ProcessingPipeline
-from src.reports import ReportGenerator
 
 
 def setup_logging(level: int = logging.INFO) -> None:
@@ -44,13 +43,13 @@ def print_banner() -> None:
     print("=" * 60)
 
 
-def print_summary(result) -> None:
-    """Print execution summary."""
+def print_summary(result, settings=None) -> None:
+    """Print execution summary (reuses the caller's settings when given)."""
     print("\n" + "=" * 60)
     print("RESUMO DA EXECUÇÃO")
     print("=" * 60)
     
-    settings = get_settings()
+    settings = settings or get_settings()
     
     print(f"1. Arquivo Excel de análise: {Path(settings.output_calculated_path).parent / 'analise_apontamento.xlsx'}")
     print(f"2. Relatório ABNT gerado: {settings.report_path}")
@@ -94,7 +93,7 @@ def main() -> int:
         
         if not result.success:
             logger.error(f"Pipeline failed: {result.message}")
-            print_summary(result)
+            print_summary(result, settings)
             return 1
 
         # Exporta apenas o arquivo Excel consolidado, modular
@@ -119,6 +118,8 @@ def main() -> int:
         logger.info("=" * 60)
         
         if result.has_productive_data or result.has_unproductive_data:
+            # Imported here so runs without report data skip loading python-docx
+            from src.reports import ReportGenerator
             generator = ReportGenerator(settings)
             col_equipe = pipeline.loader.get_column("equipe")
             
@@ -134,7 +135,7 @@ def main() -> int:
         else:
             logger.warning("No data available for report generation")
         
-        print_summary(result)
+        print_summary(result, settings)
         return 0
         
     except Exception as e:
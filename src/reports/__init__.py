@@ -1,9 +1,20 @@
-"""Reports module for generating analysis documents."""
+"""Reports module for generating analysis documents.
 
-from .report_generator import ReportGenerator
-from .docx_builder import DocxBuilder
+The generators are imported lazily (PEP 562) so that importing the package
+does not pull in python-docx/lxml until a report is actually built.
+"""
 
 __all__ = [
     "ReportGenerator",
     "DocxBuilder",
 ]
+
+
+def __getattr__(name: str):
+    if name == "ReportGenerator":
+        from .report_generator import ReportGenerator
+        return ReportGenerator
+    if name == "DocxBuilder":
+        from .docx_builder import DocxBuilder
+        return DocxBuilder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,16 +5,59 @@ This module provides a fluent interface for building Word documents
 following ABNT formatting standards.
 """
 
-from typing import List, Tuple, Optional
+from typing import List, Sequence, Tuple, Optional
+from copy import deepcopy
 from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
 from docx import Document
-from docx.shared import Inches, Pt
+from docx.oxml.ns import qn
+from docx.oxml.table import CT_Row, CT_Tbl
+from docx.table import Table, _Cell
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_TABLE_ALIGNMENT
+import numpy as np
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# ABNT page layout in twips, as written to <w:pgSz>/<w:pgMar> (A4, 30mm
+# top/left/bottom and 20mm right margins; same values as Inches(11.69) etc.)
+PAGE_HEIGHT = "16834"      # A4: 297mm
+PAGE_WIDTH = "11909"       # A4: 210mm
+MARGIN_LEFT = "1699"       # 30mm
+MARGIN_RIGHT = "1138"      # 20mm
+MARGIN_VERTICAL = "1699"   # 30mm
+
+DEFAULT_TABLE_STYLE = "Light Grid Accent 1"
+
+
+@lru_cache(maxsize=1)
+def _abnt_template() -> bytes:
+    """
+    Blank document with the ABNT page layout, serialized once per process.
+    
+    Builders load it instead of parsing python-docx's default template and
+    re-applying the page setup on every instance.
+    """
+    doc = Document()
+    # Patch the section properties directly: one attribute write per value
+    # instead of the Length conversions behind the section property setters
+    sect_pr = doc.sections[0]._sectPr
+    pg_sz = sect_pr.find(qn("w:pgSz"))
+    pg_sz.set(qn("w:w"), PAGE_WIDTH)
+    pg_sz.set(qn("w:h"), PAGE_HEIGHT)
+    pg_mar = sect_pr.find(qn("w:pgMar"))
+    pg_mar.set(qn("w:top"), MARGIN_VERTICAL)
+    pg_mar.set(qn("w:right"), MARGIN_RIGHT)
+    pg_mar.set(qn("w:bottom"), MARGIN_VERTICAL)
+    pg_mar.set(qn("w:left"), MARGIN_LEFT)
+    
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
 
 class DocxBuilder:
     """
@@ -25,19 +68,10 @@ class DocxBuilder:
     """
     
     def __init__(self):
-        """Initialize the document builder."""
-        self._doc = Document()
-        self._configure_page()
-    
-    def _configure_page(self) -> None:
-        """Configure page layout according to ABNT standards."""
-        section = self._doc.sections[0]
-        section.page_height = Inches(11.69)  # A4: 297mm
-        section.page_width = Inches(8.27)    # A4: 210mm
-        section.left_margin = Inches(1.18)   # 30mm
-        section.right_margin = Inches(0.79)  # 20mm
-        section.top_margin = Inches(1.18)    # 30mm
-        section.bottom_margin = Inches(1.18) # 30mm
+        """Initialize the document builder on a blank ABNT page."""
+        self._doc = Document(BytesIO(_abnt_template()))
+        # Detached empty tables per (style, column count), see _table_skeleton
+        self._table_skeletons = {}
     
     def add_title(self, text: str) -> "DocxBuilder":
         """
@@ -112,7 +146,7 @@ class DocxBuilder:
         
         return self
     
-    def add_bullet_list(self, items: List[str], italic: bool = False) -> "DocxBuilder":
+    def add_bullet_list(self, items: Sequence[str], italic: bool = False) -> "DocxBuilder":
         """
         Add a bulleted list to the document.
         
@@ -123,19 +157,17 @@ class DocxBuilder:
         Returns:
             Self for method chaining
         """
-        para = self._doc.add_paragraph()
-        for i, item in enumerate(items):
-            run = para.add_run(f"• {item}")
-            run.italic = italic
-            if i < len(items) - 1:
-                para.add_run("\n")
+        # One "List Bullet" paragraph (single run) per item; Word draws the bullet
+        for item in items:
+            para = self._doc.add_paragraph(style="List Bullet")
+            para.add_run(item).italic = italic
         return self
     
     def add_table(
         self,
         headers: List[str],
         rows: List[List[str]],
-        style: str = "Light Grid Accent 1"
+        style: str = DEFAULT_TABLE_STYLE
     ) -> "DocxBuilder":
         """
         Add a table to the document.
@@ -147,25 +179,99 @@ class DocxBuilder:
             
         Returns:
             Self for method chaining
+            
+        Raises:
+            ValueError: If a row has more values than there are headers
         """
-        table = self._doc.add_table(rows=1, cols=len(headers))
-        table.style = style
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
+        # A row wider than the table is a data-shape bug: fail instead of dropping values
+        for index, row_data in enumerate(rows):
+            if len(row_data) > len(headers):
+                raise ValueError(
+                    f"Table row {index} has {len(row_data)} values but only {len(headers)} headers"
+                )
         
-        # Add headers
-        hdr_cells = table.rows[0].cells
-        for i, header in enumerate(headers):
-            hdr_cells[i].text = header
+        tbl, template_tr = self._table_skeleton(style, len(headers))
+        table = Table(tbl, self._doc._body)
         
-        # Add data rows
-        for row_data in rows:
-            row_cells = table.add_row().cells
-            for i, cell_value in enumerate(row_data):
-                row_cells[i].text = str(cell_value)
+        # Header and data rows are filled the same way, then the finished
+        # <w:tbl> is attached to the body in one step
+        self._append_rows(table, template_tr, [headers] + rows)
+        self._doc.element.body._insert_tbl(tbl)
         
         self._doc.add_paragraph()  # Space after table
         return self
     
+    def _table_skeleton(self, style: str, n_cols: int) -> Tuple[CT_Tbl, CT_Row]:
+        """
+        Return an empty ``<w:tbl>`` and its template row for a style/width.
+        
+        The first table of each (style, column count) is built through
+        python-docx (style lookup, grid and alignment) and kept detached;
+        later tables start from a deep copy of it. This relies on python-docx
+        internals (``Table._cells``/``_tbl``, ``CT_Body._insert_tbl``), hence
+        the upper bound on python-docx in pyproject.toml.
+        
+        Args:
+            style: Table style name
+            n_cols: Number of columns
+            
+        Returns:
+            Tuple of (new tbl element without rows, template row element)
+        """
+        key = (style, n_cols)
+        cached = self._table_skeletons.get(key)
+        if cached is None:
+            table = self._doc.add_table(rows=1, cols=n_cols)
+            table.style = style
+            table.alignment = WD_TABLE_ALIGNMENT.CENTER
+            for cell in table._cells:
+                cell.text = "-"
+            tbl = table._tbl
+            tbl.getparent().remove(tbl)
+            template_tr = tbl.tr_lst[0]
+            tbl.remove(template_tr)
+            cached = self._table_skeletons[key] = (tbl, template_tr)
+        tbl, template_tr = cached
+        return deepcopy(tbl), template_tr
+    
+    @staticmethod
+    def _append_rows(table: Table, template_tr: CT_Row, rows: List[List[str]]) -> None:
+        """
+        Append rows cloned from a template ``<w:tr>`` with lxml.
+        
+        ``table.add_row()`` and the ``cell.text`` setter go through python-docx's
+        object model for every row and cell; here the rows are deep copies of a
+        template row (placeholder text in every cell) with the ``<w:t>`` text set
+        directly. The resulting XML is the same as with ``cell.text``.
+        
+        Args:
+            table: python-docx table to append to
+            template_tr: Row element to clone (left untouched)
+            rows: List of row data
+        """
+        # Clark names resolved once, not per row/cell
+        tag_tc, path_r, tag_t, attr_space = qn("w:tc"), f"{qn('w:p')}/{qn('w:r')}", qn("w:t"), qn("xml:space")
+        
+        # Rows are filled detached and attached to the table in one extend() call
+        new_rows = [deepcopy(template_tr) for _ in range(len(rows))]
+        for tr, row_data in zip(new_rows, rows):
+            n_values = len(row_data)
+            for i, tc in enumerate(tr.iterchildren(tag_tc)):
+                text = str(row_data[i]) if i < n_values else None
+                r = tc.find(path_r)
+                if text is None:
+                    # Cell without a value keeps the empty paragraph, as with add_row()
+                    r.getparent().remove(r)
+                elif not text or any(ch in text for ch in "\t\n\r"):
+                    # Tabs/breaks (and empty text) need python-docx's run handling
+                    _Cell(tc, table).text = text
+                else:
+                    t = r.find(tag_t)
+                    t.text = text
+                    if len(text.strip()) < len(text):
+                        t.set(attr_space, "preserve")
+        table._tbl.extend(new_rows)
+    
     def add_ranking_table(
         self,
         title: str,
@@ -196,11 +302,11 @@ class DocxBuilder:
         if description:
             self._doc.add_paragraph(description)
         
-        # Build table rows
-        rows = [
-            [str(idx + 1), team, f"{value:.2f}"]
-            for idx, (team, value) in enumerate(data)
-        ]
+        # Build table rows (positions and values formatted column-wise)
+        teams = [team for team, _ in data]
+        positions = np.arange(1, len(data) + 1).astype(str)
+        values = np.char.mod("%.2f", np.array([value for _, value in data], dtype=float))
+        rows = list(map(list, zip(positions.tolist(), teams, values.tolist())))
         
         return self.add_table(
             headers=["Posição", "Equipe", value_label],
@@ -227,14 +333,38 @@ class DocxBuilder:
         self._doc.add_paragraph()
         return self
     
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the document to an in-memory .docx.
+        
+        Returns:
+            The .docx file content
+        """
+        buffer = BytesIO()
+        self._doc.save(buffer)
+        return buffer.getvalue()
+    
     def save(self, path: str) -> None:
         """
         Save the document to a file.
         
+        The document is serialized in memory and written to a temporary file
+        next to ``path``, which then replaces it atomically; readers never see
+        a partially written report.
+        
         Args:
             path: File path to save to
         """
-        self._doc.save(path)
+        data = self.to_bytes()
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
         logger.info(f"Document saved to: {path}")
     
     @property
@@ -5,7 +5,7 @@ This module generates comprehensive Word documents with team performance
 analysis, metrics rankings, and recommendations.
 """
 
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, Callable, NamedTuple
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -18,6 +18,20 @@ from .docx_builder import DocxBuilder
 logger = logging.getLogger(__name__)
 
 
+class _Subsection(NamedTuple):
+    """
+    One analysis subsection of the report.
+    
+    Either a plain descending ranking of ``metric`` (with ``title`` and
+    ``description``) or a derived-metric table drawn by ``build_table``.
+    """
+    required: Tuple[str, ...]
+    metric: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    build_table: Optional[Callable[..., None]] = None
+
+
 class ReportGenerator:
     """
     Generator for ABNT-formatted analysis reports.
@@ -26,6 +40,9 @@ class ReportGenerator:
     including rankings, metrics comparisons, and recommendations.
     """
     
+    # Team-label prefix of the per-team overall rows added by the aggregator
+    _OVERALL_PREFIX = "MédiaTodosDias"
+    
     def __init__(self, settings: Optional[Settings] = None):
         """
         Initialize the report generator.
@@ -34,6 +51,26 @@ class ReportGenerator:
             settings: Application settings. If None, uses default settings.
         """
         self._settings = settings or get_settings()
+        
+        # Target descriptions that only depend on the settings, built once
+        metrics = self._settings.metrics
+        self._util_target = (
+            f"{metrics.utilizacao_meta*100:.0f}% de {metrics.jornada_total}min "
+            f"({metrics.tempo_util_meta:.1f}min)"
+        )
+        self._interval_target = f"{metrics.intervalo_regulamentar}min"
+        self._exe_meta_prod = f"{metrics.temp_exe_productive}min (produtivo)"
+        self._exe_meta_improd = f"{metrics.temp_exe_unproductive}min (improdutivo)"
+        
+        # Methodology bullets: identical for every report of this generator
+        self._methodology_bullets = (
+            f"TempExe: Tempo de execução (Liberada - No_Local) - Meta: {self._exe_meta_prod} / {self._exe_meta_improd}",
+            "TempDesl: Tempo de deslocamento (No_Local - A_Caminho)",
+            f"InterReg: Intervalo regulamentar (Fim_Intervalo - Início_Intervalo) - Meta: {self._interval_target}",
+            "TempPrep: Tempo de preparação da equipe",
+            f"Tempo de utilização: TempExe + TempDesl - Meta: {self._util_target}",
+            "Tempo ocioso: TempPrep + (60 - InterReg) ou TempPrep + 60 (se InterReg = 0)",
+        )
     
     def generate(
         self,
@@ -60,19 +97,7 @@ class ReportGenerator:
         
         logger.info("Generating ABNT report")
         
-        builder = DocxBuilder()
-        
-        # Title and date
-        builder.add_title("RELATÓRIO DE ANÁLISE DE DESEMPENHO DAS EQUIPES")
-        builder.add_date()
-        builder.add_space()
-        
-        # Introduction
-        self._add_introduction(builder)
-        
-        # Methodology
-        self._add_methodology(builder)
-        builder.add_page_break()
+        builder = self._start_document()
         
         # Analysis sections
         section_num = 3
@@ -105,6 +130,26 @@ class ReportGenerator:
         
         return output
     
+    def _start_document(self) -> DocxBuilder:
+        """
+        Create a builder holding the title, date, introduction and methodology.
+        """
+        builder = DocxBuilder()
+        
+        # Title and date
+        builder.add_title("RELATÓRIO DE ANÁLISE DE DESEMPENHO DAS EQUIPES")
+        builder.add_date()
+        builder.add_space()
+        
+        # Introduction
+        self._add_introduction(builder)
+        
+        # Methodology
+        self._add_methodology(builder)
+        builder.add_page_break()
+        
+        return builder
+    
     def _add_introduction(self, builder: DocxBuilder) -> None:
         """Add introduction section."""
         builder.add_paragraph(
@@ -131,16 +176,7 @@ class ReportGenerator:
             )
         )
         
-        metrics = [
-            f"TempExe: Tempo de execução (Liberada - No_Local) - Meta: {self._settings.metrics.temp_exe_productive}min (produtivo) / {self._settings.metrics.temp_exe_unproductive}min (improdutivo)",
-            "TempDesl: Tempo de deslocamento (No_Local - A_Caminho)",
-            f"InterReg: Intervalo regulamentar (Fim_Intervalo - Início_Intervalo) - Meta: {self._settings.metrics.intervalo_regulamentar}min",
-            "TempPrep: Tempo de preparação da equipe",
-            f"Tempo de utilização: TempExe + TempDesl - Meta: {self._settings.metrics.utilizacao_meta*100:.0f}% de {self._settings.metrics.jornada_total}min ({self._settings.metrics.tempo_util_meta:.1f}min)",
-            "Tempo ocioso: TempPrep + (60 - InterReg) ou TempPrep + 60 (se InterReg = 0)",
-        ]
-        
-        builder.add_bullet_list(metrics, italic=True)
+        builder.add_bullet_list(self._methodology_bullets, italic=True)
     
     def _add_analysis_section(
         self,
@@ -153,74 +189,40 @@ class ReportGenerator:
         """Add analysis section for a record type."""
         builder.add_section(str(section_num), f"ANÁLISE DE REGISTROS {tipo}")
         
-        # Filter overall averages only
-        df_geral = df[df[col_equipe].str.startswith("MédiaTodosDias", na=False)].copy()
+        # Filter overall averages only; the prefix test and the name cleanup run on the
+        # distinct team labels and are mapped back through the category codes
+        equipes = df[col_equipe].astype("category")
+        labels = equipes.cat.categories.astype(str)
+        codes = equipes.cat.codes.to_numpy()
+        is_geral = np.append(labels.str.startswith(self._OVERALL_PREFIX), False)[codes]
+        df_geral = df[is_geral].copy()
         
         if df_geral.empty:
             builder.add_paragraph(f"Nenhum dado disponível para análise de registros {tipo}.")
             return
         
-        # Clean team names
-        df_geral["Equipe_Nome"] = df_geral[col_equipe].str.replace("MédiaTodosDias", "")
+        # Clean team names (plain prefix strip, once per distinct label)
+        nomes = np.array([label.removeprefix(self._OVERALL_PREFIX) for label in labels], dtype=object)
+        df_geral["Equipe_Nome"] = nomes[codes[is_geral]]
+        team_names = df_geral["Equipe_Nome"].to_numpy()
+        derived = self._derived_metrics(df_geral)
         
         subsection = 1
-        
-        # TempExe
-        if "TempExe" in df_geral.columns:
-            data = self._get_ranking_data(df_geral, "Equipe_Nome", "TempExe", ascending=False)
-            meta = "50 min" if tipo == "PRODUTIVAS" else "20 min"
-            builder.add_ranking_table(
-                f"{section_num}.{subsection} Tempo de Execução (TempExe)",
-                data,
-                description=(
-                    "Esta métrica indica o tempo médio de execução das atividades. "
-                    "Valores muito baixos podem indicar erro de apontamento nos momentos "
-                    "'No_Local' e 'Liberada'."
-                )
-            )
-            subsection += 1
-        
-        # TempDesl
-        if "TempDesl" in df_geral.columns:
-            data = self._get_ranking_data(df_geral, "Equipe_Nome", "TempDesl", ascending=False)
-            builder.add_ranking_table(
-                f"{section_num}.{subsection} Tempo de Deslocamento (TempDesl)",
-                data,
-                description=(
-                    "Esta métrica indica o tempo médio de deslocamento. "
-                    "Valores muito baixos podem indicar erro de apontamento nos momentos "
-                    "'A_Caminho' e 'No_Local'."
-                )
-            )
-            subsection += 1
-        
-        # Tempo de Utilização
-        if "TempExe" in df_geral.columns and "TempDesl" in df_geral.columns:
-            self._add_utilization_table(builder, df_geral, section_num, subsection)
-            subsection += 1
-        
-        # InterReg
-        if "InterReg" in df_geral.columns:
-            self._add_interval_table(builder, df_geral, section_num, subsection)
-            subsection += 1
-        
-        # TempPrep
-        if "TempPrep" in df_geral.columns:
-            data = self._get_ranking_data(df_geral, "Equipe_Nome", "TempPrep", ascending=False)
-            builder.add_ranking_table(
-                f"{section_num}.{subsection} Tempo de Preparação (TempPrep)",
-                data,
-                description=(
-                    "Tempo de preparação da equipe. Valores elevados indicam possível ociosidade "
-                    "ou ineficiência no processo de preparação para novas atividades."
+        for entry in self._SUBSECTIONS:
+            if not all(col in df_geral.columns for col in entry.required):
+                continue
+            if entry.build_table is not None:
+                # Derived metric with its own table layout
+                entry.build_table(self, builder, team_names, derived, section_num, subsection)
+            else:
+                data = self._get_ranking_data(df_geral, "Equipe_Nome", entry.metric, ascending=False)
+                builder.add_ranking_table(
+                    f"{section_num}.{subsection} {entry.title}",
+                    data,
+                    description=entry.description
                 )
-            )
             subsection += 1
         
-        # Tempo Ocioso
-        if "TempPrep" in df_geral.columns and "InterReg" in df_geral.columns:
-            self._add_idle_time_table(builder, df_geral, section_num, subsection)
-        
         builder.add_page_break()
     
     def _get_ranking_data(
@@ -231,39 +233,103 @@ class ReportGenerator:
         ascending: bool = True
     ) -> List[Tuple[str, float]]:
         """Get ranking data sorted by value."""
-        df_sorted = df[[team_col, value_col]].dropna()
-        df_sorted = df_sorted.sort_values(value_col, ascending=ascending)
-        return list(zip(df_sorted[team_col], df_sorted[value_col]))
+        names, (values,) = self._rank_rows(
+            df[team_col].to_numpy(),
+            [df[value_col].to_numpy(dtype=float)],
+            0,
+            ascending=ascending
+        )
+        return list(zip(names.tolist(), values.tolist()))
+    
+    @staticmethod
+    def _rank_rows(
+        names: np.ndarray,
+        values: List[np.ndarray],
+        sort_idx: int,
+        ascending: bool = True
+    ) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """Drop incomplete rows and sort by ``values[sort_idx]`` using NumPy arrays.
+
+        Same result, tie order included, as ``dropna()`` + ``sort_values()``.
+        """
+        valid = ~pd.isna(names)
+        for arr in values:
+            valid &= ~np.isnan(arr)
+        names = names[valid]
+        values = [arr[valid] for arr in values]
+        key = values[sort_idx]
+        if ascending:
+            order = np.argsort(key, kind="quicksort")
+        else:
+            # sort_values(ascending=False) sorts the reversed array and flips the result
+            order = (len(key) - 1 - np.argsort(key[::-1], kind="quicksort"))[::-1]
+        return names[order], [arr[order] for arr in values]
+    
+    @staticmethod
+    def _table_rows(names: np.ndarray, *formatted: np.ndarray) -> List[List[str]]:
+        """Zip 1-based positions, team names and pre-formatted value columns into table rows."""
+        positions = np.arange(1, len(names) + 1).astype(str)
+        return list(map(list, zip(positions, names, *formatted)))
+    
+    def _derived_metrics(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Compute the metrics of the derived tables in a single pass.
+        
+        Each source column is read once as a float array; only the metrics
+        whose source columns are present are returned.
+        """
+        source = {
+            col: df[col].to_numpy(dtype=float)
+            for col in ("TempExe", "TempDesl", "InterReg", "TempPrep")
+            if col in df.columns
+        }
+        derived: Dict[str, np.ndarray] = {}
+        metrics = self._settings.metrics
+        
+        if "TempExe" in source and "TempDesl" in source:
+            tempo = source["TempExe"] + source["TempDesl"]
+            derived["Tempo_Utilizacao"] = tempo
+            derived["Percentual_Utilizacao"] = (tempo / metrics.jornada_total) * 100
+        
+        if "InterReg" in source:
+            interreg = source["InterReg"]
+            derived["InterReg"] = interreg
+            derived["Desvio_Meta"] = np.abs(interreg - metrics.intervalo_regulamentar)
+            
+            if "TempPrep" in source:
+                # "TempPrep + 60 se InterReg = 0" is the same value as TempPrep + (60 - InterReg)
+                derived["Tempo_Ocioso"] = source["TempPrep"] + (60.0 - interreg)
+        
+        return derived
     
     def _add_utilization_table(
         self,
         builder: DocxBuilder,
-        df: pd.DataFrame,
+        team_names: np.ndarray,
+        derived: Dict[str, np.ndarray],
         section: int,
         subsection: int
     ) -> None:
         """Add utilization analysis table."""
-        df = df.copy()
-        df["Tempo_Utilizacao"] = df["TempExe"] + df["TempDesl"]
-        df["Percentual_Utilizacao"] = (df["Tempo_Utilizacao"] / self._settings.metrics.jornada_total) * 100
-        
-        df_sorted = df[["Equipe_Nome", "Tempo_Utilizacao", "Percentual_Utilizacao"]].dropna()
-        df_sorted = df_sorted.sort_values("Percentual_Utilizacao")
+        names, (tempo, percentual) = self._rank_rows(
+            team_names,
+            [derived["Tempo_Utilizacao"], derived["Percentual_Utilizacao"]],
+            sort_idx=1
+        )
         
         builder.document.add_heading(f"{section}.{subsection} Tempo de Utilização", level=3)
         
         para = builder.document.add_paragraph()
-        para.add_run(f"Meta: {self._settings.metrics.utilizacao_meta*100:.0f}% de {self._settings.metrics.jornada_total}min ({self._settings.metrics.tempo_util_meta:.1f}min)").bold = True
+        para.add_run(f"Meta: {self._util_target}").bold = True
         
         builder.document.add_paragraph(
             "Tempo total de trabalho produtivo (execução + deslocamento). "
             "Valores abaixo de 85% indicam subutilização da jornada."
         )
         
-        rows = [
-            [str(idx + 1), row["Equipe_Nome"], f"{row['Tempo_Utilizacao']:.2f}", f"{row['Percentual_Utilizacao']:.1f}%"]
-            for idx, (_, row) in enumerate(df_sorted.iterrows())
-        ]
+        rows = self._table_rows(
+            names, np.char.mod("%.2f", tempo), np.char.mod("%.1f%%", percentual)
+        )
         
         builder.add_table(
             headers=["Posição", "Equipe", "Tempo (min)", "Utilização (%)"],
@@ -273,31 +339,32 @@ class ReportGenerator:
     def _add_interval_table(
         self,
         builder: DocxBuilder,
-        df: pd.DataFrame,
+        team_names: np.ndarray,
+        derived: Dict[str, np.ndarray],
         section: int,
         subsection: int
     ) -> None:
         """Add interval analysis table."""
-        df = df.copy()
-        df["Desvio_Meta"] = abs(df["InterReg"] - self._settings.metrics.intervalo_regulamentar)
-        
-        df_sorted = df[["Equipe_Nome", "InterReg", "Desvio_Meta"]].dropna()
-        df_sorted = df_sorted.sort_values("Desvio_Meta", ascending=False)
+        names, (interreg, desvio) = self._rank_rows(
+            team_names,
+            [derived["InterReg"], derived["Desvio_Meta"]],
+            sort_idx=1,
+            ascending=False
+        )
         
         builder.document.add_heading(f"{section}.{subsection} Intervalo Regulamentar (InterReg)", level=3)
         
         para = builder.document.add_paragraph()
-        para.add_run(f"Meta: {self._settings.metrics.intervalo_regulamentar}min (entre 4ª e 6ª hora)").bold = True
+        para.add_run(f"Meta: {self._interval_target} (entre 4ª e 6ª hora)").bold = True
         
         builder.document.add_paragraph(
             "Intervalo para refeição. Desvios significativos podem indicar "
             "irregularidades no cumprimento da jornada de trabalho."
         )
         
-        rows = [
-            [str(idx + 1), row["Equipe_Nome"], f"{row['InterReg']:.2f}", f"{row['Desvio_Meta']:.2f}"]
-            for idx, (_, row) in enumerate(df_sorted.iterrows())
-        ]
+        rows = self._table_rows(
+            names, np.char.mod("%.2f", interreg), np.char.mod("%.2f", desvio)
+        )
         
         builder.add_table(
             headers=["Posição", "Equipe", "Intervalo (min)", "Desvio da Meta"],
@@ -307,21 +374,16 @@ class ReportGenerator:
     def _add_idle_time_table(
         self,
         builder: DocxBuilder,
-        df: pd.DataFrame,
+        team_names: np.ndarray,
+        derived: Dict[str, np.ndarray],
         section: int,
         subsection: int
     ) -> None:
         """Add idle time analysis table."""
-        df = df.copy()
-        df["Tempo_Ocioso"] = np.where(
-            df["InterReg"] == 0,
-            df["TempPrep"] + 60,
-            df["TempPrep"] + (60 - df["InterReg"])
+        names, (ocioso,) = self._rank_rows(
+            team_names, [derived["Tempo_Ocioso"]], sort_idx=0, ascending=False
         )
         
-        df_sorted = df[["Equipe_Nome", "Tempo_Ocioso"]].dropna()
-        df_sorted = df_sorted.sort_values("Tempo_Ocioso", ascending=False)
-        
         builder.document.add_heading(f"{section}.{subsection} Tempo Ocioso Total", level=3)
         
         builder.document.add_paragraph(
@@ -329,10 +391,7 @@ class ReportGenerator:
             "Valores elevados indicam ociosidade operacional significativa."
         )
         
-        rows = [
-            [str(idx + 1), row["Equipe_Nome"], f"{row['Tempo_Ocioso']:.2f}"]
-            for idx, (_, row) in enumerate(df_sorted.iterrows())
-        ]
+        rows = self._table_rows(names, np.char.mod("%.2f", ocioso))
         
         builder.add_table(
             headers=["Posição", "Equipe", "Tempo Ocioso (min)"],
@@ -363,3 +422,40 @@ class ReportGenerator:
         builder.add_paragraph(
             "Este relatório deve ser utilizado como base para planos de ação corretivos e preventivos."
         )
+    
+    # Analysis subsections in report order (declared after the table builders
+    # they reference)
+    _SUBSECTIONS: Tuple[_Subsection, ...] = (
+        _Subsection(
+            required=("TempExe",),
+            metric="TempExe",
+            title="Tempo de Execução (TempExe)",
+            description=(
+                "Esta métrica indica o tempo médio de execução das atividades. "
+                "Valores muito baixos podem indicar erro de apontamento nos momentos "
+                "'No_Local' e 'Liberada'."
+            ),
+        ),
+        _Subsection(
+            required=("TempDesl",),
+            metric="TempDesl",
+            title="Tempo de Deslocamento (TempDesl)",
+            description=(
+                "Esta métrica indica o tempo médio de deslocamento. "
+                "Valores muito baixos podem indicar erro de apontamento nos momentos "
+                "'A_Caminho' e 'No_Local'."
+            ),
+        ),
+        _Subsection(required=("TempExe", "TempDesl"), build_table=_add_utilization_table),
+        _Subsection(required=("InterReg",), build_table=_add_interval_table),
+        _Subsection(
+            required=("TempPrep",),
+            metric="TempPrep",
+            title="Tempo de Preparação (TempPrep)",
+            description=(
+                "Tempo de preparação da equipe. Valores elevados indicam possível ociosidade "
+                "ou ineficiência no processo de preparação para novas atividades."
+            ),
+        ),
+        _Subsection(required=("TempPrep", "InterReg"), build_table=_add_idle_time_table),
+    )
@@ -5,13 +5,13 @@ This module handles the aggregation of calculated metrics by team and date,
 producing summary statistics for analysis.
 """
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import pandas as pd
 import numpy as np
 import logging
 
 from ..config import Settings, get_settings
-from ..core.utils import DateTimeUtils
+from ..core.utils import DateTimeUtils, DataFrameUtils
 
 logger = logging.getLogger(__name__)
 
@@ -58,35 +58,41 @@ class AggregatorService:
         
         col_equipe = columns.get("equipe")
         col_despachada = columns.get("despachada")
+        # Column names hashed once for the membership checks below
+        available = set(df.columns)
         
-        if not col_equipe or col_equipe not in df.columns:
+        if not col_equipe or col_equipe not in available:
             logger.error("Column 'Equipe' not found in dataset")
             return None
         
-        if not col_despachada or col_despachada not in df.columns:
+        if not col_despachada or col_despachada not in available:
             logger.error("Date column not found")
             return None
         
         # Extract date: prefer 'Data Referência' from CSV if present, otherwise use resolved 'despachada'
         try:
-            df = df.copy()
             date_source = None
-            if "Data Referência" in df.columns:
+            if "Data Referência" in available:
                 date_source = "Data Referência"
-            elif col_despachada and col_despachada in df.columns:
+            elif col_despachada and col_despachada in available:
                 date_source = col_despachada
             else:
                 # fallback to any column named 'Data' if present
-                if "Data" in df.columns:
+                if "Data" in available:
                     date_source = "Data"
 
             if date_source is None:
                 logger.error("No suitable date column found (Data Referência / despachada)")
                 return None
 
-            df["Data Referência"] = pd.to_datetime(
+            # Keep the day key as datetime64 (midnight) so the groupby hashes int64 values;
+            # it is converted to date objects only for the output below. The key is a
+            # separate Series, so the input frame is neither copied nor mutated.
+            # The layout is inferred once and parsed with an explicit format (each
+            # distinct string once); values that do not match fall back to dayfirst.
+            day_key = DateTimeUtils.parse_datetime(
                 df[date_source], dayfirst=True, errors="coerce"
-            ).dt.date
+            ).dt.normalize().rename("Data Referência")
         except Exception as e:
             logger.error(f"Failed to extract dates: {e}")
             return None
@@ -94,7 +100,7 @@ class AggregatorService:
         # Get calculated columns that exist
         calc_cols = [
             col for col in self._settings.calculated.all_columns
-            if col in df.columns
+            if col in available
         ]
 
         if not calc_cols:
@@ -108,45 +114,34 @@ class AggregatorService:
         # Agrupamento apenas por colunas literais do CSV
         temp_sem_ordem_col = getattr(self._settings.calculated, 'sem_ordem_jornada', 'SemOrdemJornada')
         # Group by team and the chosen date column 'Data Referência'
-        group_keys = [col_equipe, "Data Referência"]
+        # Team as a categorical key: the groupby hashes int codes, not strings
+        team_key = df[col_equipe].astype("category")
+        # Groups in order of appearance: the single sort_values below orders the output
+        grouped = df.groupby([team_key, day_key], sort=False, observed=True)
         calc_cols_no_tempsemordem = [col for col in calc_cols if col != temp_sem_ordem_col]
-        averages = df.groupby(group_keys)[calc_cols_no_tempsemordem].mean().round(2).reset_index()
+        # Every per-group reduction below shares the grouping, so they are aligned on
+        # the same (team, day) index and joined with a single concat (no merges)
+        parts = [grouped[calc_cols_no_tempsemordem].mean().round(2)]
         # Adiciona SemOrdemJornada por grupo (média)
-        if temp_sem_ordem_col in df.columns:
-            semordemjornada_mean = df.groupby(group_keys)[temp_sem_ordem_col].mean().reset_index()
-            averages = averages.merge(semordemjornada_mean, on=[col_equipe, "Data Referência"], how="left")
+        if temp_sem_ordem_col in available:
+            parts.append(grouped[temp_sem_ordem_col].mean())
 
         # Add order count per team per day
-        order_count = df.groupby(group_keys).size().reset_index(name="qtd_ordem")
-        averages = averages.merge(order_count, on=group_keys, how="left")
+        parts.append(grouped.size().rename("qtd_ordem"))
 
         # Add 'Retorno a base' (first non-null value per group)
         col_retorno_base = columns.get("retorno_base")
-        if col_retorno_base and col_retorno_base in df.columns:
-            retorno_base = df.groupby(group_keys)[col_retorno_base].first().reset_index()
-            averages = averages.merge(retorno_base, on=group_keys, how="left")
-            averages.rename(columns={col_retorno_base: "Retorno a base"}, inplace=True)
-        
-        # Rename columns to indicate averages (use same names as calculated columns)
-        # e.g. TempExe -> TempExe
-        rename_map = {col: col for col in calc_cols}
-        averages = averages.rename(columns=rename_map)
+        if col_retorno_base and col_retorno_base in available:
+            parts.append(grouped[col_retorno_base].first().rename("Retorno a base"))
 
         # Compute utilization (HT/HD) per group and HT_Faltante (minutes missing to reach meta)
         # Attempt to detect HT and HD total columns in original dataframe
-        ht_col = None
-        hd_col = None
-        for c in df.columns:
-            c_norm = c.lower().replace(" ", "")
-            if "ht" in c_norm and "total" in c_norm and ht_col is None:
-                ht_col = c
-            if "hd" in c_norm and "total" in c_norm and hd_col is None:
-                hd_col = c
+        ht_col, hd_col = self._find_total_columns(df.columns)
 
         if ht_col and hd_col:
-            # First non-null value per group (these totals are per-day/team and usually repeated)
-            ht_vals = df.groupby(group_keys)[ht_col].first().reset_index()
-            hd_vals = df.groupby(group_keys)[hd_col].first().reset_index()
+            # First non-null value per group (these totals are per-day/team and usually repeated),
+            # both totals taken from a single groupby pass
+            util_df = grouped[[ht_col, hd_col]].first()
 
             # Normalize numeric values (commas as decimal separators)
             def _to_num(s):
@@ -155,37 +150,28 @@ class AggregatorService:
                 except Exception:
                     return float('nan')
 
-            ht_vals[ht_col] = ht_vals[ht_col].apply(_to_num)
-            hd_vals[hd_col] = hd_vals[hd_col].apply(_to_num)
-
-            util_df = ht_vals.merge(hd_vals, on=group_keys, how='left')
-            util_df[ht_col] = ht_vals[ht_col]
-            util_df[hd_col] = hd_vals[hd_col]
+            util_df[ht_col] = util_df[ht_col].apply(_to_num)
+            util_df[hd_col] = util_df[hd_col].apply(_to_num)
 
-            util_df['Utilizacao'] = util_df.apply(
-                lambda r: (r[ht_col] / r[hd_col]) * 100 if r[hd_col] and not pd.isna(r[hd_col]) and r[hd_col] != 0 else float('nan'),
-                axis=1
-            )
+            # Vectorized column arithmetic; NaN (or zero HD) propagates as NaN
+            hd_valid = util_df[hd_col].where(util_df[hd_col] != 0)
+            util_df['Utilizacao'] = (util_df[ht_col] / hd_valid) * 100
 
             # HT_Faltante: minutes missing to reach meta (meta = utilizacao_meta * HD)
             meta_frac = getattr(self._settings.metrics, 'utilizacao_meta', 0.85)
-            util_df['HT_Faltante'] = util_df.apply(
-                lambda r: max(0.0, (meta_frac * r[hd_col]) - r[ht_col]) if not pd.isna(r[ht_col]) and not pd.isna(r[hd_col]) else float('nan'),
-                axis=1
-            )
+            util_df['HT_Faltante'] = ((meta_frac * util_df[hd_col]) - util_df[ht_col]).clip(lower=0.0)
 
-            # Merge Utilizacao, HT_Faltante and raw HT/HD into averages (use 'Data Referência' column)
-            util_merge_cols = [col_equipe, 'Data Referência', 'Utilizacao', 'HT_Faltante']
-            # include raw totals if available for team-level aggregation
-            if ht_col:
-                util_merge_cols.append(ht_col)
-            if hd_col:
-                util_merge_cols.append(hd_col)
+            # Utilizacao, HT_Faltante and the raw HT/HD totals (kept for team-level aggregation)
+            parts.append(util_df[['Utilizacao', 'HT_Faltante', ht_col, hd_col]])
 
-            averages = averages.merge(util_df[util_merge_cols], on=[col_equipe, 'Data Referência'], how='left')
+        averages = pd.concat(parts, axis=1).reset_index()
+        
+        # Back to plain labels for the output (and the team totals below)
+        averages[col_equipe] = averages[col_equipe].astype(team_key.cat.categories.dtype)
         
         # Sort by team and date
         averages = averages.sort_values([col_equipe, "Data Referência"])
+        averages["Data Referência"] = averages["Data Referência"].dt.date
         
         # Add overall averages per team. Include new aggregated columns if present.
         calc_cols_for_totals = list(calc_cols)
@@ -194,118 +180,140 @@ class AggregatorService:
         if 'HT_Faltante' in averages.columns:
             calc_cols_for_totals.append('HT_Faltante')
 
-        averages = self._add_team_totals(averages, col_equipe, calc_cols_for_totals)
+        # Counters for the statistics log, taken from the (small) daily frame
+        team_count = averages[col_equipe].nunique()
+        day_count = averages["Data Referência"].nunique()
+        # Raw HT/HD totals are only carried into the averages when both were found
+        total_cols = (ht_col, hd_col) if ht_col and hd_col else (None, None)
+        averages = self._add_team_totals(averages, col_equipe, calc_cols_for_totals, *total_cols)
         
         # Log statistics
-        self._log_statistics(averages, col_equipe, record_type)
+        self._log_statistics(record_type, len(averages), team_count, day_count)
         
         return averages
     
+    @staticmethod
+    def _find_total_columns(columns) -> Tuple[Optional[str], Optional[str]]:
+        """Detect the raw HT and HD total columns (first match of each) by name."""
+        ht_col = None
+        hd_col = None
+        for c in columns:
+            c_norm = str(c).lower().replace(" ", "")
+            if "ht" in c_norm and "total" in c_norm and ht_col is None:
+                ht_col = c
+            if "hd" in c_norm and "total" in c_norm and hd_col is None:
+                hd_col = c
+        return ht_col, hd_col
+    
     def _add_team_totals(
         self,
         df: pd.DataFrame,
         col_equipe: str,
-        calc_cols: List[str]
+        calc_cols: List[str],
+        ht_col_name: Optional[str] = None,
+        hd_col_name: Optional[str] = None
     ) -> pd.DataFrame:
-        """Add overall average rows for each team."""
-        result_frames = []
-        teams = df[col_equipe].unique()
+        """Add overall average rows for each team.
+
+        ``ht_col_name``/``hd_col_name`` are the raw HT/HD total columns resolved once
+        by the caller; when given, Utilizacao is recomputed from their sums.
+        """
+        logger.info(f"Processing {df[col_equipe].nunique()} teams...")
         
-        logger.info(f"Processing {len(teams)} teams...")
+        # One groupby for every team at once (teams in order of first appearance)
+        grouped = df.groupby(col_equipe, sort=False)
+        sizes = grouped.size()
+        teams = sizes.index.tolist()
+        if not teams:
+            return pd.DataFrame()
         
-        for team in teams:
-            team_data = df[df[col_equipe] == team].copy()
-            result_frames.append(team_data)
-            
-            # Calculate overall average for team
-            overall_avg = {}
-            for col in calc_cols:
-                col_media = f"{col}"
-                if col_media in team_data.columns:
-                    values = team_data[col_media].dropna()
-                    overall_avg[col_media] = round(values.mean(), 2) if len(values) > 0 else np.nan
-
-            # Para Utilizacao, manter cálculo pela soma dos totais
-            ht_col_name = None
-            hd_col_name = None
-            for c in team_data.columns:
-                c_norm = str(c).lower().replace(" ", "")
-                if "ht" in c_norm and "total" in c_norm and ht_col_name is None:
-                    ht_col_name = c
-                if "hd" in c_norm and "total" in c_norm and hd_col_name is None:
-                    hd_col_name = c
-
-            if ht_col_name and hd_col_name:
-                ht_sum = pd.to_numeric(team_data[ht_col_name].astype(str).str.replace(",", "."), errors="coerce").sum()
-                hd_sum = pd.to_numeric(team_data[hd_col_name].astype(str).str.replace(",", "."), errors="coerce").sum()
-                if hd_sum and not pd.isna(hd_sum) and hd_sum != 0:
-                    overall_avg['Utilizacao'] = round((ht_sum / hd_sum) * 100, 2)
-                else:
-                    overall_avg['Utilizacao'] = np.nan
-
-            # Para HT_Faltante, usar a média dos valores diários
-            if 'HT_Faltante' in team_data.columns:
-                ht_faltante_vals = team_data['HT_Faltante'].dropna()
-                overall_avg['HT_Faltante'] = round(ht_faltante_vals.mean(), 2) if len(ht_faltante_vals) > 0 else np.nan
-
-            # Calculate mean for 'Retorno a base' if present
-            if "Retorno a base" in team_data.columns:
-                retorno_vals = team_data["Retorno a base"].dropna()
-                # Converter para float, ignorando erros
-                retorno_vals_num = pd.to_numeric(retorno_vals.astype(str).str.replace(",", "."), errors="coerce")
-                overall_avg["Retorno a base"] = round(retorno_vals_num.mean(), 2) if len(retorno_vals_num.dropna()) > 0 else np.nan
-
+        def _to_num(s: pd.Series) -> pd.Series:
+            # Valores com vírgula decimal (ex.: "12,5") convertidos para float;
+            # colunas já numéricas dispensam a ida e volta por string
+            if pd.api.types.is_numeric_dtype(s):
+                return s.astype(float)
+            return pd.to_numeric(s.astype(str).str.replace(",", ".", regex=False), errors="coerce")
+        
+        # Create overall rows
+        # Use 'Data Referência' as the date column for the overall row
+        date_key = 'Data Referência' if 'Data Referência' in df.columns else ('Data' if 'Data' in df.columns else 'Data Referência')
+        totals = pd.DataFrame({
+            col_equipe: [f"MédiaTodosDias{team}" for team in teams],
+            date_key: "GERAL",
             # Calculate total orders for team
-            total_orders = team_data["qtd_ordem"].sum() if "qtd_ordem" in team_data.columns else 0
-
-            # Create overall row
-            # Use 'Data Referência' as the date column for the overall row
-            date_key = 'Data Referência' if 'Data Referência' in team_data.columns else ('Data' if 'Data' in team_data.columns else 'Data Referência')
-            overall_row = {
-                col_equipe: f"MédiaTodosDias{team}",
-                date_key: "GERAL",
-                "qtd_ordem": int(total_orders),
-            }
-            overall_row.update(overall_avg)
-
-            result_frames.append(pd.DataFrame([overall_row]))
-            
-            logger.debug(f"  - {team}: {len(team_data)} days processed")
+            "qtd_ordem": (
+                grouped["qtd_ordem"].sum().astype(int).to_numpy()
+                if "qtd_ordem" in df.columns else 0
+            ),
+        })
+        
+        # Overall average per team of each daily column (NaN skipped, as dropna().mean()).
+        # Each team's values go through Series.mean/sum, not the grouped kernels: those
+        # add up in another order, which moves some rounded GERAL values by 0.01
+        mean_cols = list(dict.fromkeys(col for col in calc_cols if col in df.columns))
+        # Para HT_Faltante, usar a média dos valores diários
+        if 'HT_Faltante' in df.columns and 'HT_Faltante' not in mean_cols:
+            mean_cols.append('HT_Faltante')
+        if mean_cols:
+            means = grouped[mean_cols].agg(lambda s: s.dropna().mean()).round(2)
+            for col in mean_cols:
+                totals[col] = means[col].to_numpy()
         
-        if result_frames:
-            combined = pd.concat(result_frames, ignore_index=True)
-            # Remove raw HT/HD total columns from final output to keep previous shape
-            cols_to_drop = [c for c in combined.columns if isinstance(c, str) and 'ht' in c.lower() and 'total' in c.lower()]
-            cols_to_drop += [c for c in combined.columns if isinstance(c, str) and 'hd' in c.lower() and 'total' in c.lower()]
-            if cols_to_drop:
-                combined = combined.drop(columns=cols_to_drop, errors='ignore')
-            return combined
+        # Para Utilizacao, manter cálculo pela soma dos totais
+        if ht_col_name and hd_col_name:
+            sums = pd.DataFrame({
+                "ht": _to_num(df[ht_col_name]),
+                "hd": _to_num(df[hd_col_name]),
+            }).groupby(df[col_equipe], sort=False).agg(lambda s: s.sum())
+            hd_sum = sums["hd"].where(sums["hd"] != 0)
+            totals['Utilizacao'] = ((sums["ht"] / hd_sum) * 100).round(2).to_numpy()
         
-        return pd.DataFrame()
+        # Calculate mean for 'Retorno a base' if present
+        if "Retorno a base" in df.columns:
+            retorno = _to_num(df["Retorno a base"]).groupby(df[col_equipe], sort=False).agg(lambda s: s.dropna().mean())
+            totals["Retorno a base"] = retorno.round(2).to_numpy()
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for team, n_days in sizes.items():
+                logger.debug(f"  - {team}: {n_days} days processed")
+        
+        # Single concat, then place each team's overall row right after its daily rows
+        # (stable sort keeps the original order of the daily rows)
+        combined = pd.concat([df, totals], ignore_index=True)
+        team_codes = np.concatenate([
+            pd.Categorical(df[col_equipe], categories=teams).codes,
+            np.arange(len(teams)),
+        ])
+        is_total = np.concatenate([np.zeros(len(df), dtype=np.int8), np.ones(len(teams), dtype=np.int8)])
+        combined = combined.take(np.lexsort((is_total, team_codes))).reset_index(drop=True)
+        # Remove raw HT/HD total columns from final output to keep previous shape
+        cols_to_drop = [c for c in combined.columns if isinstance(c, str) and 'ht' in c.lower() and 'total' in c.lower()]
+        cols_to_drop += [c for c in combined.columns if isinstance(c, str) and 'hd' in c.lower() and 'total' in c.lower()]
+        if cols_to_drop:
+            combined = combined.drop(columns=cols_to_drop, errors='ignore')
+        return combined
     
     def _log_statistics(
         self,
-        df: pd.DataFrame,
-        col_equipe: str,
-        record_type: str
+        record_type: str,
+        total_rows: int,
+        team_count: int,
+        day_count: int
     ) -> None:
-        """Log aggregation statistics."""
-        if df.empty:
+        """Log aggregation statistics from counters known by the caller.
+
+        ``_add_team_totals`` adds exactly one 'MédiaTodosDias' row per team, so the
+        row counts follow from ``team_count`` without scanning the output frame.
+        """
+        if not total_rows:
             return
         
-        # Count teams (excluding 'MédiaTodosDias' rows)
-        regular_rows = df[~df[col_equipe].str.startswith("MédiaTodosDias", na=False)]
-        total_rows = df[df[col_equipe].str.startswith("MédiaTodosDias", na=False)]
-        
-        teams = regular_rows[col_equipe].nunique()
-        days = regular_rows["Data"].nunique() if "Data" in regular_rows else 0
-        
         logger.info(f"\nStatistics for {record_type}:")
-        logger.info(f"- Total teams: {teams}")
-        logger.info(f"- Days with records: {days}")
-        logger.info(f"- Daily records: {len(regular_rows)}")
-        logger.info(f"- 'MédiaTodosDias' rows added: {len(total_rows)}")
-        logger.info(f"- Total rows in output: {len(df)}")
+        logger.info(f"- Total teams: {team_count}")
+        logger.info(f"- Days with records: {day_count}")
+        logger.info(f"- Daily records: {total_rows - team_count}")
+        logger.info(f"- 'MédiaTodosDias' rows added: {team_count}")
+        logger.info(f"- Total rows in output: {total_rows}")
     
     def filter_by_status(
         self,
@@ -326,12 +334,16 @@ class AggregatorService:
         
         if not col_status or col_status not in df.columns:
             logger.warning("Status column not found, treating all as productive")
-            return df.copy(), pd.DataFrame()
+            # Read-only downstream (see below), so the frame is returned without a copy
+            return df, pd.DataFrame()
         
-        mask = df[col_status].astype(str).str.strip().str.lower() == "improdutivo"
+        # Normalization runs on the distinct status labels only (see DataFrameUtils.status_mask)
+        mask = DataFrameUtils.status_mask(df[col_status], "improdutivo")
         
-        df_unproductive = df[mask].copy()
-        df_productive = df[~mask].copy()
+        # Boolean indexing already materializes each partition; downstream steps only
+        # read them, so no extra defensive copy is taken
+        df_unproductive = df[mask]
+        df_productive = df[~mask]
         
         logger.info(f"Total records: {len(df)}")
         logger.info(f"Unproductive records: {len(df_unproductive)}")
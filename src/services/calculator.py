@@ -5,13 +5,13 @@ This module contains the business logic for calculating various time-based
 metrics from displacement records.
 """
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import pandas as pd
 import numpy as np
 import logging
 
 from ..config import Settings, get_settings
-from ..core.utils import DateTimeUtils
+from ..core.utils import DateTimeUtils, DataFrameUtils
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +24,16 @@ class CalculatorService:
     including preparation time, execution time, displacement time, and more.
     """
     
+    # Colunas de horário usadas por TempPrep e SemOrdemJornada (convertidas uma vez)
+    _TIMESTAMP_COLUMNS = ("A_Caminho", "Despachada", "Liberada", "Inicio Intervalo", "Fim Intervalo")
+    # Colunas com vírgula decimal usadas pelas mesmas duas métricas
+    _NUMERIC_COLUMNS = ("1º Desloc", "1º Despacho", "Intervalo")
+    # Métricas copiadas do CSV: (chave da coluna de origem, atributo em CalculatedColumns, rótulo)
+    _PASSTHROUGH_COLUMNS = (
+        ("tr_ordem", "temp_exe", "TR Ordem"),
+        ("tl_ordem", "temp_desl", "TL Ordem"),
+    )
+    
     def __init__(self, settings: Optional[Settings] = None):
         """
         Initialize the calculator service.
@@ -42,6 +52,10 @@ class CalculatorService:
         """
         Process DataFrame and calculate all metrics.
         
+        The input frame is never modified: the sort and the first calculation
+        (``DataFrame.assign``) already return new frames, and only those are
+        written to, so no upfront defensive copy is taken.
+        
         Args:
             df: Input DataFrame with raw displacement data
             columns: Resolved column name mappings
@@ -51,18 +65,20 @@ class CalculatorService:
         """
         logger.info("Starting metric calculations")
         
-        # Create a copy to avoid modifying original
-        result = df.copy()
-
         # Note: datetime parsing is performed locally within calculations; global *_dt
         # columns and parsing logic were removed per user request.
 
+        # Ordena uma vez por equipe/data/A_Caminho e lê cada coluna de horário uma única vez;
+        # TempPrep e SemOrdemJornada compartilham as mesmas séries
+        result, timestamps = self._sort_and_parse_timestamps(df)
+        # Colunas com vírgula decimal lidas pelas duas (ex.: "Intervalo"), convertidas uma vez
+        numbers = self._parse_numeric_columns(result)
+
         # Calculate metrics
-        result = self._calculate_temp_prep_equipe(result)
-        result = self._copy_temp_exe(result, columns)
-        result = self._copy_temp_desl(result, columns)
+        result = self._calculate_temp_prep_equipe(result, timestamps, numbers)
+        result = self._copy_passthrough_numeric(result, columns)
         # TempoPadrao and Jornada logic/columns removed per user request
-        result = self._calculate_sem_ordem_jornada(result, columns)
+        result = self._calculate_sem_ordem_jornada(result, columns, timestamps, numbers)
 
         # Round calculated columns
         result = self._round_calculated_columns(result)
@@ -74,9 +90,69 @@ class CalculatorService:
 
         return result
     
-    def _calculate_temp_prep_equipe(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _parse_datetime(self, df: pd.DataFrame, col: str) -> pd.Series:
+        """Parse a literal CSV timestamp column using the configured format (NaT if absent)."""
+        if col not in df.columns:
+            return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+        return self._dt_utils.parse_datetime(df[col], format=self._settings.files.datetime_format)
+    
+    def _to_float(self, df: pd.DataFrame, col: str) -> pd.Series:
+        """Convert a literal CSV column with decimal commas (e.g. "12,5") to float (NaN if absent)."""
+        if col not in df.columns:
+            return pd.Series(np.nan, index=df.index)
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            # Already numeric: no string round trip
+            return values.astype(float)
+        return pd.to_numeric(values.astype(str).str.replace(",", ".", regex=False), errors="coerce")
+    
+    def _parse_numeric_columns(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Convert the comma-decimal columns used by the calculations once, aligned with ``df``."""
+        return {col: self._to_float(df, col) for col in self._NUMERIC_COLUMNS}
+    
+    def _sort_and_parse_timestamps(
+        self,
+        df: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, Dict[str, pd.Series]]:
+        """
+        Ordena por equipe, data e A_Caminho e converte as colunas de horário uma única vez.
+        
+        Args:
+            df: DataFrame com as colunas literais do CSV
+            
+        Returns:
+            Tupla (DataFrame ordenado, {coluna: série datetime alinhada ao DataFrame ordenado})
+        """
+        timestamps = {col: self._parse_datetime(df, col) for col in self._TIMESTAMP_COLUMNS}
+        if "A_Caminho" in df.columns:
+            chaves = pd.DataFrame({
+                "equipe": df["Equipe"].to_numpy(),
+                "data": df["Data Referência"].to_numpy(),
+                "a_caminho": timestamps["A_Caminho"].to_numpy(),
+            })
+            # Mesma ordenação de antes; as posições reordenam o DataFrame e as séries juntos
+            ordem = chaves.sort_values(["equipe", "data", "a_caminho"]).index.to_numpy()
+            df = df.take(ordem)
+            timestamps = {col: serie.take(ordem) for col, serie in timestamps.items()}
+        return df, timestamps
+    
+    def _calculate_temp_prep_equipe(
+        self,
+        df: pd.DataFrame,
+        timestamps: Optional[Dict[str, pd.Series]] = None,
+        numbers: Optional[Dict[str, pd.Series]] = None
+    ) -> pd.DataFrame:
         """
         Calcula TempPrep conforme regra detalhada do usuário, usando apenas colunas literais do CSV.
+
+        O cálculo é vetorizado por equipe/data: a primeira ordem recebe "1º Desloc"; as demais
+        usam A_Caminho - Despachada quando a ordem foi despachada após a Liberada anterior, ou
+        A_Caminho - Liberada anterior caso contrário. O intervalo é descontado apenas na primeira
+        ordem do grupo em que ele cai dentro da janela de preparação.
+
+        ``timestamps`` (de ``_sort_and_parse_timestamps``) indica que ``df`` já está ordenado e
+        evita converter os horários de novo; ``numbers`` (de ``_parse_numeric_columns``, sobre o
+        ``df`` já ordenado) faz o mesmo para as colunas numéricas.
         """
         calc_col = self._settings.calculated.temp_prep_equipe
         col_equipe = "Equipe"
@@ -89,123 +165,91 @@ class CalculatorService:
         col_inicio_intervalo = "Inicio Intervalo"
         col_fim_intervalo = "Fim Intervalo"
 
-        # Ordena por equipe, data e A_Caminho — parse temporário sem criar _dt permanentes
-        if col_a_caminho in df.columns:
-            tmp_series = pd.to_datetime(df[col_a_caminho], dayfirst=True, errors='coerce')
-            df = df.assign(_tmp_a_caminho=tmp_series).sort_values([col_equipe, col_dataref, '_tmp_a_caminho']).drop(columns=['_tmp_a_caminho']).copy()
-
-        df[calc_col] = np.nan
-
+        def to_float(col: str) -> pd.Series:
+            if numbers is not None and col in numbers:
+                return numbers[col]
+            return self._to_float(df, col)
 
-        for (equipe, dataref), grupo in df.groupby([col_equipe, col_dataref]):
-            # sort group by parsed A_Caminho without creating persistent _dt column
-            if col_a_caminho in grupo.columns:
-                grupo = grupo.assign(_tmp_a = pd.to_datetime(grupo[col_a_caminho], dayfirst=True, errors='coerce'))
-                grupo = grupo.sort_values('_tmp_a').reset_index().drop(columns=['_tmp_a'])
-            else:
-                grupo = grupo.reset_index()
-            temp_prep_list = []
-            is_inter_a_caminho = False
-
-            # Primeira ordem: valor da coluna "1º Desloc"
-            try:
-                temp_prep_val = float(str(grupo.loc[0, col_primeiro_desloc]).replace(',', '.'))
-            except Exception:
-                temp_prep_val = float('nan')
-            temp_prep_list.append(temp_prep_val)
-
-            # Para as demais ordens
-            for i in range(1, len(grupo)):
-                try:
-                    a_caminho = pd.to_datetime(grupo.loc[i, col_a_caminho], dayfirst=True, errors='coerce')
-                    despachada = pd.to_datetime(grupo.loc[i, col_despachada], dayfirst=True, errors='coerce')
-                    liberada = pd.to_datetime(grupo.loc[i-1, col_liberada], dayfirst=True, errors='coerce')
-                    inicio_intervalo = pd.to_datetime(grupo.loc[i, col_inicio_intervalo], dayfirst=True, errors='coerce') if col_inicio_intervalo in grupo.columns else pd.NaT
-                    fim_intervalo = pd.to_datetime(grupo.loc[i, col_fim_intervalo], dayfirst=True, errors='coerce') if col_fim_intervalo in grupo.columns else pd.NaT
-                    intervalo = grupo.loc[i, col_intervalo] if col_intervalo in grupo.columns else None
-                    intervalo_float = float(str(intervalo).replace(',', '.')) if pd.notna(intervalo) and intervalo != '' else None
-                except Exception:
-                    a_caminho = despachada = liberada = inicio_intervalo = fim_intervalo = None
-                    intervalo_float = None
-
-                desconta_intervalo = False
-                if pd.notna(despachada) and pd.notna(liberada) and despachada > liberada:
-                    temp_prep = (a_caminho - despachada).total_seconds() / 60.0 if pd.notna(a_caminho) and pd.notna(despachada) else float('nan')
-                    if (
-                        pd.notna(inicio_intervalo) and pd.notna(fim_intervalo)
-                        and inicio_intervalo >= despachada - pd.Timedelta(minutes=10) and fim_intervalo <= a_caminho + pd.Timedelta(minutes=10) and not is_inter_a_caminho
-                    ):
-                        is_inter_a_caminho = True
-                        desconta_intervalo = True
-                else:
-                    temp_prep = (a_caminho - liberada).total_seconds() / 60.0 if pd.notna(a_caminho) and pd.notna(liberada) else float('nan')
-                    if (
-                        pd.notna(inicio_intervalo) and pd.notna(fim_intervalo)
-                        and inicio_intervalo >= liberada - pd.Timedelta(minutes=10) and fim_intervalo <= a_caminho + pd.Timedelta(minutes=10) and not is_inter_a_caminho
-                    ):
-                        is_inter_a_caminho = True
-                        desconta_intervalo = True
-
-                if desconta_intervalo and intervalo_float is not None and intervalo_float >= 0:
-                    # desconta até 60 minutos e add o excedente acima de 60 minutos
-                    temp_prep -= min(intervalo_float, 60.0)
-                    excedente = intervalo_float - 60.0
-                    if excedente > 0:
-                        temp_prep += excedente
-                    # não deixa negativo
-                    if temp_prep < 0:
-                        temp_prep = 0.0
-                 
-
-                temp_prep_list.append(temp_prep)
-
-            # Atribui os valores calculados ao DataFrame original
-            df.loc[grupo['index'], calc_col] = temp_prep_list
-
-            # Adiciona TempPrepJornada: somatória da lista temp_prep_list (mesma lógica de SemOrdemJornada)
-            try:
-                # converte para array numérico, ignora NaN ao somar
-                total_temp_prep = float(np.nansum([float(x) for x in temp_prep_list if x is not None and x != '' and not (isinstance(x, float) and np.isnan(x))]))
-            except Exception:
-                total_temp_prep = float('nan')
-            df.loc[grupo['index'], 'TempPrepJornada'] = total_temp_prep
-
-        df[calc_col] = pd.to_numeric(df[calc_col], errors='coerce')
-        return df
-    
-    def _copy_temp_exe(self, df: pd.DataFrame, columns: Dict[str, Optional[str]]) -> pd.DataFrame:
-        """Copy TempExe from TR Ordem column (already exists in CSV)."""
-        calc_col = self._settings.calculated.temp_exe
-        col_tr_ordem = columns.get("tr_ordem")
-        
-        if col_tr_ordem and col_tr_ordem in df.columns:
-            # Convert to numeric, handling comma as decimal separator
-            df[calc_col] = pd.to_numeric(
-                df[col_tr_ordem].astype(str).str.replace(",", "."),
-                errors="coerce"
-            )
-            logger.info(f"TempExe copied from '{col_tr_ordem}'")
+        # Ordena por equipe, data e A_Caminho — parse temporário sem criar _dt permanentes
+        if timestamps is None:
+            df, timestamps = self._sort_and_parse_timestamps(df)
+
+        a_caminho = timestamps[col_a_caminho]
+        despachada = timestamps[col_despachada]
+        inicio_intervalo = timestamps[col_inicio_intervalo]
+        fim_intervalo = timestamps[col_fim_intervalo]
+
+        keys = [df[col_equipe], df[col_dataref]]
+        posicao = df.groupby(keys, sort=False).cumcount()
+        is_first = posicao == 0
+        liberada_anterior = timestamps[col_liberada].groupby(keys, sort=False).shift(1)
+
+        # Despachada após a Liberada anterior: prepara a partir do despacho
+        despachada_apos = despachada.notna() & liberada_anterior.notna() & (despachada > liberada_anterior)
+        referencia = despachada.where(despachada_apos, liberada_anterior)
+        temp_prep = self._dt_utils.diff_minutes_series(a_caminho, referencia)
+
+        # Valores de "Intervalo" não numéricos invalidam a ordem (mesmo comportamento do cálculo por linha)
+        intervalo = to_float(col_intervalo)
+        if col_intervalo in df.columns:
+            raw_intervalo = df[col_intervalo]
+            intervalo_invalido = raw_intervalo.notna() & (raw_intervalo != '') & intervalo.isna()
         else:
-            logger.warning("TR Ordem column not found, TempExe will be NaN")
-            df[calc_col] = np.nan
-        
-        return df
+            intervalo_invalido = pd.Series(False, index=df.index)
+
+        tolerancia = pd.Timedelta(minutes=10)
+        intervalo_na_janela = (
+            ~is_first & ~intervalo_invalido
+            & (inicio_intervalo >= referencia - tolerancia)
+            & (fim_intervalo <= a_caminho + tolerancia)
+        )
+        primeiro_na_janela = intervalo_na_janela & (intervalo_na_janela.groupby(keys, sort=False).cumsum() == 1)
+
+        # desconta até 60 minutos e add o excedente acima de 60 minutos, sem deixar negativo
+        desconta_intervalo = primeiro_na_janela & (intervalo >= 0)
+        ajustado = (temp_prep - np.minimum(intervalo, 60.0) + (intervalo - 60.0).clip(lower=0.0)).clip(lower=0.0)
+        temp_prep = temp_prep.where(~desconta_intervalo, ajustado)
+        temp_prep = temp_prep.mask(intervalo_invalido, np.nan)
+
+        # Primeira ordem: valor da coluna "1º Desloc"
+        temp_prep = temp_prep.where(~is_first, to_float(col_primeiro_desloc))
+        temp_prep = temp_prep.where(posicao.notna())
+
+        # Insere as colunas calculadas de uma vez (evita fragmentar o BlockManager)
+        # TempPrepJornada: somatória do TempPrep do grupo (mesma lógica de SemOrdemJornada)
+        return df.assign(**{
+            calc_col: pd.to_numeric(temp_prep, errors='coerce'),
+            'TempPrepJornada': temp_prep.groupby(keys, sort=False).transform('sum'),
+        })
     
-    def _copy_temp_desl(self, df: pd.DataFrame, columns: Dict[str, Optional[str]]) -> pd.DataFrame:
-        """Copy TempDesl from TL Ordem column (already exists in CSV)."""
-        calc_col = self._settings.calculated.temp_desl
-        col_tl_ordem = columns.get("tl_ordem")
+    def _copy_passthrough_numeric(
+        self,
+        df: pd.DataFrame,
+        columns: Dict[str, Optional[str]]
+    ) -> pd.DataFrame:
+        """
+        Copy TempExe/TempDesl from the TR/TL Ordem columns (already exist in CSV).
         
-        if col_tl_ordem and col_tl_ordem in df.columns:
-            # Convert to numeric, handling comma as decimal separator
-            df[calc_col] = pd.to_numeric(
-                df[col_tl_ordem].astype(str).str.replace(",", "."),
-                errors="coerce"
-            )
-            logger.info(f"TempDesl copied from '{col_tl_ordem}'")
-        else:
-            logger.warning("TL Ordem column not found, TempDesl will be NaN")
-            df[calc_col] = np.nan
+        Both copies are handled in one pass over ``_PASSTHROUGH_COLUMNS``.
+        
+        Args:
+            df: DataFrame to add the columns to (modified in place)
+            columns: Resolved column name mappings
+            
+        Returns:
+            The same DataFrame, with the copied columns
+        """
+        for source_key, calc_attr, source_label in self._PASSTHROUGH_COLUMNS:
+            calc_col = getattr(self._settings.calculated, calc_attr)
+            source_col = columns.get(source_key)
+            
+            if source_col and source_col in df.columns:
+                # Convert to numeric, handling comma as decimal separator
+                df[calc_col] = self._to_float(df, source_col)
+                logger.info(f"{calc_col} copied from '{source_col}'")
+            else:
+                logger.warning(f"{source_label} column not found, {calc_col} will be NaN")
+                df[calc_col] = np.nan
         
         return df
     
@@ -214,39 +258,21 @@ class CalculatorService:
         # No action: keep original 'tempo_padrao' column from CSV; user requested to remove TempoPadrao logic/column.
         return df
     
-    def _calculate_jornada(self, df: pd.DataFrame, columns: Dict[str, Optional[str]]) -> pd.DataFrame:
-        """Calculate Jornada_min = Fim Calendario - Inicio Calendario."""
-        calc_col = self._settings.calculated.jornada
-        col_fim_calendario = columns.get("fim_calendario")
-        
-        if col_fim_calendario and col_fim_calendario in df.columns:
-            # Parse Fim Calendario
-            df["FimCalendario_dt"] = self._dt_utils.parse_datetime(df[col_fim_calendario])
-        
-        if "FimCalendario_dt" in df.columns and "InicioCalendario_dt" in df.columns:
-            df[calc_col] = df.apply(
-                lambda row: self._dt_utils.diff_minutes(
-                    row["FimCalendario_dt"], row["InicioCalendario_dt"]
-                ),
-                axis=1
-            )
-            logger.info("Jornada_min calculated (Fim Calendario - Inicio Calendario)")
-        else:
-            logger.warning("Fim/Inicio Calendario columns not found, Jornada_min will be NaN")
-            df[calc_col] = np.nan
-        
-        return df
-    
     
     
 
     def _calculate_sem_ordem_jornada(
         self,
         df: pd.DataFrame,
-        columns: Dict[str, Optional[str]]
+        columns: Dict[str, Optional[str]],
+        timestamps: Optional[Dict[str, pd.Series]] = None,
+        numbers: Optional[Dict[str, pd.Series]] = None
     ) -> pd.DataFrame:
         """
         Calcula SemOrdemJornada (total do dia) e SemOSentreOS (entre cada ordem).
+
+        O cálculo é vetorizado por equipe/data, sem laço por grupo ou conversões escalares.
+        ``timestamps`` e ``numbers`` têm o mesmo papel que em ``_calculate_temp_prep_equipe``.
         """
         col_jornada = "SemOrdemJornada"
         col_entreos = "SemOSentreOS"
@@ -259,93 +285,91 @@ class CalculatorService:
         col_inicio_intervalo = "Inicio Intervalo"
         col_fim_intervalo = "Fim Intervalo"
 
+        def to_float(col: str) -> pd.Series:
+            if numbers is not None and col in numbers:
+                return numbers[col]
+            return self._to_float(df, col)
+
         # Ordena por equipe, data e A_Caminho (parse temporário sem criar _dt permanentes)
-        if "A_Caminho" in df.columns:
-            tmp_series = pd.to_datetime(df["A_Caminho"], dayfirst=True, errors='coerce')
-            df = df.assign(_tmp_a_caminho=tmp_series).sort_values([col_equipe, col_dataref, '_tmp_a_caminho']).drop(columns=['_tmp_a_caminho']).copy()
+        if timestamps is None:
+            df, timestamps = self._sort_and_parse_timestamps(df)
+
+        keys = [df[col_equipe], df[col_dataref]]
+        grupos = df.groupby(keys, sort=False)
+        posicao = grupos.cumcount()
+        is_first = posicao == 0
+
+        # Linha da primeira ordem de cada linha: os grupos são numerados pela ordem de
+        # aparição, logo a k-ésima primeira ordem é a do grupo k (chaves nulas: sem grupo)
+        codigo = grupos.ngroup()
+        tem_grupo = codigo.notna().to_numpy()
+        codigos = codigo.fillna(0).to_numpy(dtype=np.intp)
+        primeiras = np.flatnonzero(is_first.to_numpy())
+        if len(primeiras):
+            linha_primeira = primeiras[codigos]
+        else:
+            linha_primeira = np.zeros(len(df), dtype=np.intp)
 
-        df[col_jornada] = np.nan
-        df[col_entreos] = np.nan
+        def valor_primeira(serie: pd.Series) -> pd.Series:
+            """Propaga para todo o grupo o valor da primeira ordem (mesmo se nulo)."""
+            return pd.Series(serie.to_numpy()[linha_primeira], index=serie.index).where(tem_grupo)
 
-        for (equipe, dataref), grupo in df.groupby([col_equipe, col_dataref]):
-            # sort group by parsed A_Caminho without creating persistent _dt column
-            if "A_Caminho" in grupo.columns:
-                grupo = grupo.assign(_tmp_a = pd.to_datetime(grupo["A_Caminho"], dayfirst=True, errors='coerce'))
-                grupo = grupo.sort_values('_tmp_a').reset_index().drop(columns=['_tmp_a'])
-            else:
-                grupo = grupo.reset_index()
-            entre_ordem = 0.0
-            is_inter_ordem = False
-            entreos_list = []
-            # Primeira ordem do dia: valor da coluna "1º Despacho"
-            try:
-                temp_sem_ordem_val = float(str(grupo.loc[0, col_primeiro_despacho]).replace(',', '.'))
-                inicio_intervalo = pd.to_datetime(grupo.loc[0, col_inicio_intervalo], dayfirst=True, errors='coerce') if col_inicio_intervalo in grupo.columns else pd.NaT
-                fim_intervalo = pd.to_datetime(grupo.loc[0, col_fim_intervalo], dayfirst=True, errors='coerce') if col_fim_intervalo in grupo.columns else pd.NaT
-                intervalo = grupo.loc[0, col_intervalo] if col_intervalo in grupo.columns else None
-                intervalo_float = float(str(intervalo).replace(',', '.')) if pd.notna(intervalo) and intervalo != '' else None
-            except Exception:
-                temp_sem_ordem_val = float('nan') 
-                inicio_intervalo = fim_intervalo = pd.NaT
-                intervalo_float = None
-
-            # Primeira ordem: valor direto
-            try:
-                entreos_list.append(float(str(grupo.loc[0, col_primeiro_despacho]).replace(',', '.')))
-            except Exception:
-                entreos_list.append(float('nan'))
-
-            # Calcula entre_ordem e verifica intervalo entre Liberada e Despachada
-            for i in range(1, len(grupo)):
-                try:
-                    despachada = pd.to_datetime(grupo.loc[i, col_despachada], dayfirst=True, errors='coerce')
-                    liberada = pd.to_datetime(grupo.loc[i-1, col_liberada], dayfirst=True, errors='coerce')
-                except Exception:
-                    despachada = liberada = pd.NaT
-                entreos = float('nan')
-                desconta_intervalo = False
-                if pd.notna(despachada) and pd.notna(liberada) and despachada > liberada:
-                    entreos = (despachada - liberada).total_seconds() / 60.0
-                    # Verifica se o intervalo está totalmente entre liberada e despachada
-                    if (
-                        pd.notna(inicio_intervalo) and pd.notna(fim_intervalo)
-                        and inicio_intervalo >= liberada - pd.Timedelta(minutes=10) and fim_intervalo <= despachada + pd.Timedelta(minutes=10) and not is_inter_ordem
-                    ):
-                        is_inter_ordem = True
-                        desconta_intervalo = True
-
-                # Ajusta o entreos para descontar o intervalo na célula específica (mesma regra de TempPrep)
-                if desconta_intervalo and intervalo_float is not None and intervalo_float >= 0 and pd.notna(entreos):
-                    entreos -= min(intervalo_float, 60.0)
-                    excedente = intervalo_float - 60.0
-                    if excedente > 0:
-                        entreos += excedente
-                    if entreos < 0:
-                        entreos = 0.0
-
-                # Acumula o (possivelmente ajustado) entreos
-                if pd.notna(entreos):
-                    entre_ordem += entreos
-                entreos_list.append(entreos)
-
-            # Soma o total de entre-ordens (já ajustado por célula quando necessário)
-            temp_sem_ordem_val += entre_ordem
-
-            # Repete o valor para todas as ordens da equipe/data
-            df.loc[grupo['index'], col_jornada] = temp_sem_ordem_val
-            # Preenche SemOSentreOS para cada ordem
-            df.loc[grupo['index'], col_entreos] = entreos_list
-
-        df[col_jornada] = pd.to_numeric(df[col_jornada], errors='coerce')
-        df[col_entreos] = pd.to_numeric(df[col_entreos], errors='coerce')
-        return df
+        # Primeira ordem do dia: valor da coluna "1º Despacho"; texto não numérico invalida a jornada
+        primeiro_despacho = to_float(col_primeiro_despacho)
+        if col_primeiro_despacho in df.columns:
+            primeiro_invalido = df[col_primeiro_despacho].notna() & primeiro_despacho.isna()
+        else:
+            primeiro_invalido = pd.Series(True, index=df.index)
+
+        # Intervalo (e sua janela) vêm da primeira ordem do grupo
+        intervalo = to_float(col_intervalo)
+        if col_intervalo in df.columns:
+            raw_intervalo = df[col_intervalo]
+            intervalo_invalido = raw_intervalo.notna() & (raw_intervalo != '') & intervalo.isna()
+        else:
+            intervalo_invalido = pd.Series(False, index=df.index)
+        primeira_invalida = valor_primeira((primeiro_invalido | intervalo_invalido).astype(float)) == 1
+        intervalo_grupo = valor_primeira(intervalo)
+        inicio_intervalo = valor_primeira(timestamps[col_inicio_intervalo])
+        fim_intervalo = valor_primeira(timestamps[col_fim_intervalo])
+
+        # Entre ordens: Despachada da ordem atual - Liberada da ordem anterior (apenas se positivo)
+        despachada = timestamps[col_despachada]
+        liberada_anterior = timestamps[col_liberada].groupby(keys, sort=False).shift(1)
+        despachada_apos = despachada.notna() & liberada_anterior.notna() & (despachada > liberada_anterior)
+        entreos = self._dt_utils.diff_minutes_series(despachada, liberada_anterior).where(despachada_apos & ~is_first)
+
+        # Desconta o intervalo apenas na primeira ordem em que ele cabe entre Liberada e Despachada
+        tolerancia = pd.Timedelta(minutes=10)
+        intervalo_na_janela = (
+            despachada_apos & ~is_first & ~primeira_invalida
+            & (inicio_intervalo >= liberada_anterior - tolerancia)
+            & (fim_intervalo <= despachada + tolerancia)
+        )
+        primeiro_na_janela = intervalo_na_janela & (intervalo_na_janela.groupby(keys, sort=False).cumsum() == 1)
+        desconta_intervalo = primeiro_na_janela & (intervalo_grupo >= 0)
+        ajustado = (entreos - np.minimum(intervalo_grupo, 60.0) + (intervalo_grupo - 60.0).clip(lower=0.0)).clip(lower=0.0)
+        entreos = entreos.where(~desconta_intervalo, ajustado)
+
+        # SemOrdemJornada: "1º Despacho" da primeira ordem + soma dos entre-ordens, repetido no grupo
+        # (soma por código de grupo numa única passada; nulos contam como 0, como no sum do pandas)
+        pesos = np.where(tem_grupo, entreos.fillna(0.0).to_numpy(), 0.0)
+        soma_grupo = np.bincount(codigos, weights=pesos, minlength=len(primeiras))
+        entre_ordem = pd.Series(soma_grupo[codigos], index=df.index).where(tem_grupo)
+        jornada = (valor_primeira(primeiro_despacho) + entre_ordem).mask(primeira_invalida, np.nan)
+
+        # SemOSentreOS: primeira ordem recebe "1º Despacho", demais o entre-ordens ajustado
+        entreos = entreos.where(~is_first, primeiro_despacho)
+
+        return df.assign(**{
+            col_jornada: jornada.where(posicao.notna()),
+            col_entreos: entreos.where(posicao.notna()),
+        })
     
     def _round_calculated_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Round all calculated columns to 2 decimal places."""
-        for col in self._settings.calculated.all_columns:
-            if col in df.columns:
-                df[col] = df[col].round(2)
-        return df
+        cols = [col for col in self._settings.calculated.all_columns if col in df.columns]
+        return DataFrameUtils.safe_round_inplace(df, cols, 2)
     
     def _reorder_columns(
         self,
@@ -373,12 +397,12 @@ class CalculatorService:
             return df
 
         # Find insertion index: the smallest index among present desired columns
-        indices = [existing.index(c) for c in present_desired]
-        insert_at = min(indices)
+        desired_set = set(present_desired)
+        insert_at = next(i for i, c in enumerate(existing) if c in desired_set)
 
         # Build list without the present desired columns
-        remaining = [c for c in existing if c not in present_desired]
+        remaining = [c for c in existing if c not in desired_set]
 
         # Insert desired columns in the requested order at the original first position
         new_cols = remaining[:insert_at] + present_desired + remaining[insert_at:]
-        return df.reindex(columns=new_cols)
+        return df.iloc[:, df.columns.get_indexer(new_cols)]
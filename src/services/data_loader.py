@@ -8,6 +8,7 @@ with robust handling of various encodings and column name variations.
 from pathlib import Path
 from typing import Optional, Dict
 import pandas as pd
+import csv
 import logging
 
 from ..config import Settings, get_settings
@@ -66,12 +67,13 @@ class DataLoaderService:
             
             for encoding in encodings_to_try:
                 try:
+                    # Detect the separator once, then parse with the fast C engine
+                    # (sep=None would force the pure-Python engine for the whole file)
                     df = pd.read_csv(
                         path,
                         dtype=str,
                         encoding=encoding,
-                        sep=None,  # Auto-detect separator
-                        engine='python'  # Required for sep=None
+                        sep=self._sniff_separator(path, encoding),
                     )
                     logger.info(f"Successfully loaded with encoding: {encoding}")
                     break
@@ -94,6 +96,25 @@ class DataLoaderService:
             logger.error(f"Failed to load file: {e}")
             raise ValueError(f"Failed to parse CSV file: {e}")
     
+    @staticmethod
+    def _sniff_separator(path: Path, encoding: str) -> str:
+        """
+        Detect the field separator from the header line.
+        
+        Args:
+            path: Path to the CSV file
+            encoding: Encoding used to decode the file
+            
+        Returns:
+            The detected separator character
+            
+        Raises:
+            csv.Error: If no separator can be determined
+        """
+        with open(path, "r", encoding=encoding, newline="") as fh:
+            header = fh.readline()
+        return csv.Sniffer().sniff(header).delimiter
+    
     def _resolve_columns(self) -> None:
         """Resolve all column mappings based on settings."""
         if self._column_resolver is None:
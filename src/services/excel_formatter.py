@@ -271,12 +271,16 @@ class ExcelFormatter:
                 equipe_col = col
                 break
 
+        # Iterate plain tuples instead of building a Series per row with df.iloc
+        separate_teams = ws.title.lower() == "deslocamento_calculado" and equipe_col
+        equipe_pos = df.columns.get_loc(equipe_col) if separate_teams else None
+
         prev_team = None
         excel_row = 2
-        for row_idx in range(len(df)):
+        for row in df.itertuples(index=False, name=None):
             # Inserir linha de separação se mudar de equipe (apenas para deslocamento_calculado)
-            if ws.title.lower() == "deslocamento_calculado" and equipe_col:
-                current_team = df.iloc[row_idx][equipe_col]
+            if separate_teams:
+                current_team = row[equipe_pos]
                 if prev_team is not None and current_team != prev_team:
                     for col_idx in range(1, len(df.columns) + 1):
                         cell = ws.cell(row=excel_row, column=col_idx)
@@ -284,7 +288,7 @@ class ExcelFormatter:
                     excel_row += 1
                 prev_team = current_team
             # Escrever dados normalmente
-            for col_idx, value in enumerate(df.iloc[row_idx], 1):
+            for col_idx, value in enumerate(row, 1):
                 cell = ws.cell(row=excel_row, column=col_idx)
                 if pd.isna(value):
                     cell.value = ""
@@ -429,12 +433,16 @@ class ExcelFormatter:
         # State for separator insertion (kept as before)
         prev_team_sep = None
 
+        # Column values read once as arrays (no per-row df.iloc lookups)
+        team_values = df[equipe_col].to_numpy() if equipe_col else None
+        date_values = df[date_col].to_numpy() if date_col else None
+
         excel_row = 2
         for row_idx in range(len(df)):
             # Separator row for deslocamento_calculado (unchanged behaviour)
             team_sep = False
             if ws.title.lower() == "deslocamento_calculado" and equipe_col:
-                current_team_sep = df.iloc[row_idx][equipe_col]
+                current_team_sep = team_values[row_idx]
                 if prev_team_sep is not None and current_team_sep != prev_team_sep:
                     for col_idx in range(1, num_cols + 1):
                         cell = ws.cell(row=excel_row, column=col_idx)
@@ -446,13 +454,13 @@ class ExcelFormatter:
 
             # Update toggles based on equipe and date changes (compare with previous data row)
             if equipe_col and not disable_team_zebra:
-                current_team = df.iloc[row_idx][equipe_col]
+                current_team = team_values[row_idx]
                 if prev_team_toggle is not None and current_team != prev_team_toggle:
                     team_toggle = not team_toggle
                 prev_team_toggle = current_team
 
             if date_col and not disable_date_zebra:
-                current_date = df.iloc[row_idx][date_col]
+                current_date = date_values[row_idx]
                 if prev_date_toggle is not None and current_date != prev_date_toggle:
                     date_toggle = not date_toggle
                 prev_date_toggle = current_date
@@ -8,6 +8,7 @@ data loading, calculation, aggregation, and report generation.
 from pathlib import Path
 from typing import Optional
 import pandas as pd
+import numpy as np
 import logging
 
 from ..config import Settings, get_settings
@@ -76,7 +77,10 @@ class ProcessingPipeline:
             valid_prefixes = [f"{a}-{t}-" for a in area_prefixes for t in tipo_prefixes]
             col_equipe = columns.get("equipe")
             if col_equipe and col_equipe in df.columns:
-                df = df[df[col_equipe].astype(str).str.startswith(tuple(valid_prefixes))]
+                # Prefix test on the distinct team names only, mapped back via category codes
+                equipes = df[col_equipe].astype("category")
+                valid = equipes.cat.categories.astype(str).str.startswith(tuple(valid_prefixes))
+                df = df[np.append(valid, False)[equipes.cat.codes]]
             result.total_records = len(df)
             
             # Step 2: Calculate metrics
@@ -0,0 +1,83 @@
+"""Tests for the aggregation service."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services import AggregatorService
+
+
+@pytest.fixture
+def aggregator():
+    return AggregatorService()
+
+
+class TestAddTeamTotals:
+    """AggregatorService._add_team_totals ('MédiaTodosDias' rows)."""
+
+    def test_overall_row_follows_each_team(self, aggregator):
+        daily = pd.DataFrame({
+            "Equipe": ["B", "A", "B", "A"],
+            "Data Referência": ["01/03", "01/03", "02/03", "02/03"],
+            "TempExe": [10.0, 40.0, 20.0, np.nan],
+            "qtd_ordem": [2, 3, 4, 1],
+        })
+
+        result = aggregator._add_team_totals(daily, "Equipe", ["TempExe"])
+
+        assert result["Equipe"].tolist() == ["B", "B", "MédiaTodosDiasB", "A", "A", "MédiaTodosDiasA"]
+        totals = result[result["Data Referência"] == "GERAL"].set_index("Equipe")
+        assert totals.loc["MédiaTodosDiasB", "TempExe"] == 15.0
+        assert totals.loc["MédiaTodosDiasA", "TempExe"] == 40.0
+        assert totals.loc["MédiaTodosDiasB", "qtd_ordem"] == 6
+        assert totals.loc["MédiaTodosDiasA", "qtd_ordem"] == 4
+
+    def test_mean_rounding_matches_per_team_series_mean(self, aggregator):
+        # The grouped mean kernel adds these up in another order and rounds to 169.72
+        values = [292.93, 55.4, 269.68, 24.6, 203.37, 82.86, np.nan, 271.38, 157.58]
+        daily = pd.DataFrame({
+            "Equipe": ["A"] * len(values),
+            "Data Referência": [f"{day:02d}/03" for day in range(1, len(values) + 1)],
+            "TempPrep": values,
+            "qtd_ordem": 1,
+        })
+
+        result = aggregator._add_team_totals(daily, "Equipe", ["TempPrep"])
+
+        assert result["TempPrep"].iloc[-1] == 169.73
+        assert result["TempPrep"].iloc[-1] == round(pd.Series(values).dropna().mean(), 2)
+
+    def test_utilizacao_from_total_sums(self, aggregator):
+        daily = pd.DataFrame({
+            "Equipe": ["A", "A"],
+            "Data Referência": ["01/03", "02/03"],
+            "Utilizacao": [50.0, 100.0],
+            "HT Total": ["100,5", "300"],
+            "HD Total": ["400", "400"],
+            "Retorno a base": ["10,5", "20"],
+            "qtd_ordem": [1, 1],
+        })
+
+        result = aggregator._add_team_totals(
+            daily, "Equipe", ["Utilizacao"], "HT Total", "HD Total"
+        )
+
+        overall = result.iloc[-1]
+        # (100.5 + 300) / (400 + 400), not the mean of the daily percentages
+        assert overall["Utilizacao"] == 50.06
+        assert overall["Retorno a base"] == 15.25
+        assert "HT Total" not in result.columns
+        assert "HD Total" not in result.columns
+
+    def test_zero_hd_total_gives_nan_utilizacao(self, aggregator):
+        daily = pd.DataFrame({
+            "Equipe": ["A"],
+            "Data Referência": ["01/03"],
+            "HT Total": [100.0],
+            "HD Total": [0.0],
+            "qtd_ordem": [1],
+        })
+
+        result = aggregator._add_team_totals(daily, "Equipe", [], "HT Total", "HD Total")
+
+        assert np.isnan(result["Utilizacao"].iloc[-1])
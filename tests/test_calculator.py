@@ -0,0 +1,170 @@
+"""Tests for the calculator service."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services import CalculatorService
+
+DAY = "05/03/2024"
+
+
+def _row(equipe="A", data=DAY, **values):
+    """One CSV-like record; times are given as HH:MM on ``data``."""
+    row = {
+        "Equipe": equipe,
+        "Data Referência": data,
+        "A_Caminho": None,
+        "Despachada": None,
+        "Liberada": None,
+        "Inicio Intervalo": None,
+        "Fim Intervalo": None,
+        "1º Desloc": None,
+        "1º Despacho": None,
+        "Intervalo": None,
+    }
+    for key, value in values.items():
+        column = {
+            "desloc": "1º Desloc",
+            "despacho": "1º Despacho",
+            "inicio_intervalo": "Inicio Intervalo",
+            "fim_intervalo": "Fim Intervalo",
+        }.get(key, key)
+        if column in ("A_Caminho", "Despachada", "Liberada", "Inicio Intervalo", "Fim Intervalo"):
+            value = f"{data} {value}" if value else None
+        row[column] = value
+    return row
+
+
+@pytest.fixture
+def calculator():
+    return CalculatorService()
+
+
+def _process(calculator, rows):
+    return calculator.process(pd.DataFrame(rows), {}).reset_index(drop=True)
+
+
+def _values(series):
+    return [None if pd.isna(v) else v for v in series.tolist()]
+
+
+class TestTempPrep:
+    """TempPrep / TempPrepJornada."""
+
+    def test_first_order_and_reference_per_team_day(self, calculator):
+        rows = [
+            # Out of order on purpose: rows are sorted by team, day and A_Caminho
+            _row(Despachada="08:50", A_Caminho="09:20", Liberada="10:00"),
+            _row(Despachada="07:10", A_Caminho="07:30", Liberada="08:00", desloc="15,5"),
+            _row(Despachada="08:20", A_Caminho="08:30", Liberada="09:00"),
+            _row(equipe="B", Despachada="07:00", A_Caminho="07:40", Liberada="08:00", desloc="7"),
+            _row(data="06/03/2024", Despachada="07:00", A_Caminho="07:05", Liberada="08:00", desloc="3"),
+        ]
+
+        result = _process(calculator, rows)
+
+        assert result["Equipe"].tolist() == ["A", "A", "A", "A", "B"]
+        # First order of each team/day: "1º Desloc"; then A_Caminho - Despachada when
+        # dispatched after the previous Liberada, otherwise A_Caminho - previous Liberada
+        assert result["TempPrep"].tolist() == [15.5, 10.0, 20.0, 3.0, 7.0]
+        assert result["TempPrepJornada"].tolist() == [45.5, 45.5, 45.5, 3.0, 7.0]
+
+    def test_interval_discounted_once_per_team_day(self, calculator):
+        rows = [
+            _row(Despachada="07:00", A_Caminho="07:30", Liberada="08:00", desloc="5"),
+            _row(Despachada="08:00", A_Caminho="09:30", Liberada="10:00",
+                 Intervalo="45", inicio_intervalo="08:15", fim_intervalo="09:00"),
+            _row(Despachada="10:05", A_Caminho="10:40", Liberada="11:00",
+                 Intervalo="30", inicio_intervalo="10:05", fim_intervalo="10:35"),
+        ]
+
+        result = _process(calculator, rows)
+
+        assert result["TempPrep"].tolist() == [5.0, 45.0, 35.0]
+        assert result["TempPrepJornada"].tolist() == [85.0] * 3
+
+    def test_interval_capped_at_60_minutes_plus_excess(self, calculator):
+        rows = [
+            _row(Despachada="07:00", A_Caminho="07:30", Liberada="08:00", desloc="5"),
+            _row(Despachada="08:00", A_Caminho="10:00", Liberada="10:30",
+                 Intervalo="80", inicio_intervalo="08:10", fim_intervalo="09:30"),
+            _row(equipe="B", Despachada="07:00", A_Caminho="07:30", Liberada="08:00", desloc="5"),
+            _row(equipe="B", Despachada="08:00", A_Caminho="08:30", Liberada="09:00",
+                 Intervalo="45", inicio_intervalo="08:00", fim_intervalo="08:35"),
+        ]
+
+        result = _process(calculator, rows)
+
+        # 120 - min(80, 60) + (80 - 60); 30 - 45 is clipped to 0
+        assert result["TempPrep"].tolist() == [5.0, 80.0, 5.0, 0.0]
+
+    def test_missing_timestamp_or_invalid_interval_gives_nan(self, calculator):
+        rows = [
+            _row(Despachada="07:00", A_Caminho="07:30", Liberada="08:00", desloc="10"),
+            _row(Despachada="08:10", A_Caminho="08:30", Liberada="09:00"),
+            _row(Despachada="09:10", A_Caminho="09:40", Liberada="10:00", Intervalo="abc"),
+            _row(Despachada="10:10", Liberada="11:00"),
+        ]
+
+        result = _process(calculator, rows)
+
+        assert _values(result["TempPrep"]) == [10.0, 20.0, None, None]
+        assert result["TempPrepJornada"].tolist() == [30.0] * 4
+
+
+class TestSemOrdemJornada:
+    """SemOrdemJornada / SemOSentreOS."""
+
+    def test_gaps_between_orders_with_interval_discount(self, calculator):
+        rows = [
+            _row(Despachada="07:00", A_Caminho="07:10", Liberada="08:00", despacho="12",
+                 Intervalo="60", inicio_intervalo="12:00", fim_intervalo="13:00"),
+            _row(Despachada="08:30", A_Caminho="08:40", Liberada="12:00"),
+            _row(Despachada="13:20", A_Caminho="13:30", Liberada="14:00"),
+            _row(Despachada="13:50", A_Caminho="14:10", Liberada="15:00"),
+        ]
+
+        result = _process(calculator, rows)
+
+        # 30 min gap, then 80 - 60 (interval between Liberada and Despachada);
+        # dispatched before the previous Liberada: no gap
+        assert _values(result["SemOSentreOS"]) == [12.0, 30.0, 20.0, None]
+        assert result["SemOrdemJornada"].tolist() == [62.0] * 4
+
+    def test_interval_capped_at_60_minutes_plus_excess(self, calculator):
+        rows = [
+            _row(Despachada="07:00", A_Caminho="07:10", Liberada="08:00", despacho="0",
+                 Intervalo="90", inicio_intervalo="08:10", fim_intervalo="09:40"),
+            _row(Despachada="10:00", A_Caminho="10:10", Liberada="11:00"),
+        ]
+
+        result = _process(calculator, rows)
+
+        # 120 - min(90, 60) + (90 - 60)
+        assert result["SemOSentreOS"].tolist() == [0.0, 90.0]
+        assert result["SemOrdemJornada"].tolist() == [90.0, 90.0]
+
+    def test_first_order_per_team_day(self, calculator):
+        rows = [
+            _row(Despachada="07:00", A_Caminho="07:10", Liberada="08:00", despacho="5"),
+            _row(Despachada="08:15", A_Caminho="08:20", Liberada="09:00"),
+            _row(equipe="B", Despachada="07:00", A_Caminho="07:10", Liberada="08:00", despacho="8"),
+            _row(data="06/03/2024", Despachada="08:30", A_Caminho="08:40", Liberada="09:00", despacho="4"),
+        ]
+
+        result = _process(calculator, rows)
+
+        assert result["SemOSentreOS"].tolist() == [5.0, 15.0, 4.0, 8.0]
+        assert result["SemOrdemJornada"].tolist() == [20.0, 20.0, 4.0, 8.0]
+
+    def test_invalid_first_dispatch_invalidates_the_day(self, calculator):
+        rows = [
+            _row(Despachada="07:00", A_Caminho="07:10", Liberada="08:00", despacho="x"),
+            _row(Despachada="08:15", A_Caminho="08:20", Liberada="09:00"),
+        ]
+
+        result = _process(calculator, rows)
+
+        assert _values(result["SemOrdemJornada"]) == [None, None]
+        assert _values(result["SemOSentreOS"]) == [None, 15.0]
@@ -0,0 +1,75 @@
+"""Tests for the DOCX document builder."""
+
+from io import BytesIO
+
+import pytest
+from docx import Document
+
+from src.reports.docx_builder import DEFAULT_TABLE_STYLE, DocxBuilder
+
+
+def _cells(table):
+    return [[cell.text for cell in row.cells] for row in table.rows]
+
+
+class TestAddTable:
+    """DocxBuilder.add_table."""
+
+    def test_headers_and_rows(self):
+        builder = DocxBuilder()
+
+        builder.add_table(["Posição", "Equipe", "Valor"], [["1", "A", "12.50"], ["2", "B", "7.00"]])
+
+        table = builder.document.tables[0]
+        assert _cells(table) == [
+            ["Posição", "Equipe", "Valor"],
+            ["1", "A", "12.50"],
+            ["2", "B", "7.00"],
+        ]
+        assert table.style.name == DEFAULT_TABLE_STYLE
+
+    def test_short_rows_leave_cells_empty(self):
+        builder = DocxBuilder()
+
+        builder.add_table(["A", "B", "C"], [["1"], []])
+
+        assert _cells(builder.document.tables[0])[1:] == [["1", "", ""], ["", "", ""]]
+
+    def test_special_text_matches_cell_text_setter(self):
+        values = ["  padded ", "tab\there", "line\nbreak", "", 3.5]
+        builder = DocxBuilder()
+        builder.add_table(["a", "b", "c", "d", "e"], [values])
+
+        reference = Document()
+        table = reference.add_table(rows=1, cols=5)
+        for cell, value in zip(table.rows[0].cells, values):
+            cell.text = str(value)
+
+        assert _cells(builder.document.tables[0])[1] == _cells(table)[0]
+
+    def test_repeated_tables_are_independent(self):
+        builder = DocxBuilder()
+
+        builder.add_table(["A", "B"], [["1", "2"]])
+        builder.add_table(["A", "B"], [["3", "4"], ["5", "6"]])
+
+        first, second = builder.document.tables
+        assert _cells(first) == [["A", "B"], ["1", "2"]]
+        assert _cells(second) == [["A", "B"], ["3", "4"], ["5", "6"]]
+
+    def test_tables_survive_a_round_trip(self):
+        builder = DocxBuilder()
+        builder.add_paragraph("Antes")
+        builder.add_table(["A", "B"], [["1", "2"]])
+
+        document = Document(BytesIO(builder.to_bytes()))
+
+        assert _cells(document.tables[0]) == [["A", "B"], ["1", "2"]]
+        assert document.paragraphs[0].text == "Antes"
+
+    def test_row_wider_than_headers_raises(self):
+        builder = DocxBuilder()
+
+        with pytest.raises(ValueError, match="row 1 has 3 values"):
+            builder.add_table(["A", "B"], [["1", "2"], ["3", "4", "5"]])
+        assert builder.document.tables == []
@@ -0,0 +1,58 @@
+"""Tests for the core utilities."""
+
+import numpy as np
+import pandas as pd
+
+from src.core.utils import DateTimeUtils
+
+
+class TestParseDatetime:
+    """DateTimeUtils.parse_datetime with inferred formats."""
+
+    def test_mixed_day_first_and_iso(self):
+        series = pd.Series(["05/03/2024 07:00", "2024-03-05 09:00", "2024-03-20 09:00"])
+
+        parsed = DateTimeUtils.parse_datetime(series)
+
+        assert parsed.tolist() == [
+            pd.Timestamp("2024-03-05 07:00"),
+            pd.Timestamp("2024-03-05 09:00"),
+            pd.Timestamp("2024-03-20 09:00"),
+        ]
+
+    def test_mixed_iso_first(self):
+        series = pd.Series(["2024-03-05 09:00:00", "20/03/2024 07:30"])
+
+        parsed = DateTimeUtils.parse_datetime(series)
+
+        assert parsed.tolist() == [
+            pd.Timestamp("2024-03-05 09:00"),
+            pd.Timestamp("2024-03-20 07:30"),
+        ]
+
+    def test_object_column_with_missing_values_is_stripped(self):
+        series = pd.Series([" 05/03/2024 07:00 ", None, np.nan, "2024-03-20 09:00 "], dtype=object)
+
+        parsed = DateTimeUtils.parse_datetime(series)
+
+        assert parsed.iloc[0] == pd.Timestamp("2024-03-05 07:00")
+        assert parsed.iloc[1:3].isna().all()
+        assert parsed.iloc[3] == pd.Timestamp("2024-03-20 09:00")
+
+    def test_explicit_format_falls_back_to_known_layouts(self):
+        series = pd.Series(["05/03/2024 07:00", "2024-03-05 09:00"])
+
+        parsed = DateTimeUtils.parse_datetime(series, format="%d/%m/%Y %H:%M")
+
+        assert parsed.tolist() == [
+            pd.Timestamp("2024-03-05 07:00"),
+            pd.Timestamp("2024-03-05 09:00"),
+        ]
+
+    def test_invalid_value_is_coerced(self):
+        series = pd.Series(["05/03/2024 07:00", "sem data"])
+
+        parsed = DateTimeUtils.parse_datetime(series)
+
+        assert parsed.iloc[0] == pd.Timestamp("2024-03-05 07:00")
+        assert pd.isna(parsed.iloc[1])